@@ -0,0 +1,148 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Headless batch renderer: draws every plot listed in a JSON spec across a process pool.
+
+Example spec::
+
+    {
+        "files": ["dummy_cvd_data_2000.csv"],
+        "formats": ["png", "pdf"],
+        "dpi": 300,
+        "plots": [
+            {"type": "Histogram", "x": ["Baseline_age_year", "eGFR_mLmin173m2"], "bins": 40},
+            {"type": "Scatter Plot", "x": "Baseline_age_year",
+             "y": ["LDL_Cholesterol_mmolL", "eGFR_mLmin173m2"], "hue": "Male_gender", "log_scale": true},
+            {"type": "Heatmap (Correlation)"}
+        ]
+    }
+
+"x", "y" and "hue" take a column name or a list of names; every combination
+is rendered for every file.
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+
+import matplotlib
+matplotlib.use("Agg")
+
+import plot_engine
+from plot_engine import PlotSpec
+
+_frames = {}
+
+
+def as_list(value):
+    if value is None:
+        return [None]
+    return value if isinstance(value, list) else [value]
+
+
+def pair_page_count(df):
+    """Pages of df's pair grid; 1 when it has too few numeric columns, so the job reports the error."""
+    try:
+        return plot_engine.PairGrid(df, plot_engine.numeric_columns(df)).page_count
+    except plot_engine.PlotError:
+        return 1
+
+
+def expand_jobs(spec, pair_pages=None):
+    """One job per (file, plot type, column combination), and one per page of a pair grid.
+
+    pair_pages maps each file to its pair grid's page count (see pair_page_count).
+    """
+    formats = spec.get("formats", ["png"])
+    dpi = spec.get("dpi", 300)
+    jobs = []
+    for path in spec["files"]:
+        for plot in spec["plots"]:
+            for x, y, hue in itertools.product(as_list(plot.get("x")), as_list(plot.get("y")), as_list(plot.get("hue"))):
+                plot_spec = PlotSpec(plot["type"], x, y, hue, plot.get("bins", 30), plot.get("log_scale", False))
+                if plot_spec.plot_type != "Pair Plot":
+                    jobs.append((path, plot_spec, formats, dpi, output_stem(path, plot_spec)))
+                    continue
+                # Pages are independent figures, so they spread across the pool.
+                pages = (pair_pages or {}).get(path, 1)
+                stem = output_stem(path, plot_spec)
+                for page in range(pages):
+                    jobs.append((path, replace(plot_spec, page=page), formats, dpi, f"{stem}__p{page + 1}" if pages > 1 else stem))
+    return jobs
+
+
+def output_stem(path, plot_spec):
+    parts = [os.path.splitext(os.path.basename(path))[0], plot_spec.plot_type]
+    parts += [col for col in (plot_spec.col1, plot_spec.col2, plot_spec.col3) if col is not None]
+    if plot_spec.log_scale:
+        parts.append("log")
+    return "__".join(re.sub(r"[^A-Za-z0-9_.-]+", "_", part).strip("_") for part in parts)
+
+
+def render_job(job, output_dir):
+    """Render one job in a worker process; each worker loads a given file only once."""
+    path, plot_spec, formats, dpi, stem = job
+    if path not in _frames:
+        _frames[path] = plot_engine.load_csv(path)
+    df = _frames[path]
+    if plot_spec.plot_type == "Pair Plot":
+        fig = plot_engine.PairGrid(df, plot_engine.numeric_columns(df)).render(plot_spec.page)
+    else:
+        fig = plot_engine.render_plot(df, plot_spec)[0]
+    paths = [os.path.join(output_dir, f"{stem}.{fmt}") for fmt in formats]
+    plot_engine.export_figure(fig, paths, dpi=dpi)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render plots from CSV files without the GUI.")
+    parser.add_argument("spec", help="JSON file listing files, plots and output formats")
+    parser.add_argument("-o", "--output-dir", default="plots", help="directory for the rendered figures (default: plots)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="number of worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as handle:
+        spec = json.load(handle)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Build each file's columnar cache once up front so workers memory-map it instead of all parsing the CSV.
+    wants_pairs = any(plot["type"] == "Pair Plot" for plot in spec["plots"])
+    pair_pages = {}
+    load_errors = {}
+    for path in spec["files"]:
+        try:
+            df = plot_engine.load_csv(path)
+        except Exception as e:
+            # A missing or malformed file fails only its own plots.
+            load_errors[path] = e
+            continue
+        if wants_pairs:
+            pair_pages[path] = pair_page_count(df)
+    jobs = expand_jobs(spec, pair_pages)
+
+    failures = 0
+    for job in jobs:
+        if job[0] in load_errors:
+            failures += 1
+            print(f"FAILED {job[4]}: {load_errors[job[0]]}", file=sys.stderr)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(render_job, job, args.output_dir): job for job in jobs if job[0] not in load_errors}
+        for future in as_completed(futures):
+            stem = futures[future][4]
+            try:
+                for written in future.result():
+                    print(written)
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {stem}: {e}", file=sys.stderr)
+
+    print(f"{len(jobs) - failures} of {len(jobs)} plots rendered.", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
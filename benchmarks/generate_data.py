@@ -0,0 +1,158 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Synthetic CSV files with the columns and distributions of dummy_cvd_data_2000.csv, at any row count.
+
+Rows are generated and appended in chunks, so memory stays flat from 10^4 to
+10^8 rows. Follow-up columns stay consistent with each other: deaths carry a
+registered date and cause, and times to event are censored at Today_date.
+
+    python benchmarks/generate_data.py 1000000 -o benchmarks/data/cvd_1000000.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # falls back to DataFrame.to_csv, about ten times slower
+    pa = None
+    pa_csv = None
+
+CHUNK_ROWS = 1_000_000
+BASELINE_START = np.datetime64("2000-01-01")
+BASELINE_END = np.datetime64("2004-12-31")
+TODAY = np.datetime64("2019-12-31")
+DATE_FORMAT = "%d/%m/%Y"
+
+# Marginal rates and ranges measured on dummy_cvd_data_2000.csv.
+FLAG_RATES = {
+    "Diabetes_mellitus": 0.241,
+    "Hypertension": 0.838,
+    "ASCVD": 0.145,
+    "Dyslipidemia": 0.834,
+    "Heart_failure": 0.091,
+    "Previous_AF_or_atrial_flutter": 0.106,
+    "Statins_and_fibrates": 0.693,
+    "Antihypertensive_drugs": 0.869,
+}
+NULL_RATES = {
+    "Systolic_blood_pressure_mmHg": 0.048,
+    "Diastolic_blood_pressure_mmHg": 0.047,
+    "LDL_Cholesterol_mmolL": 0.095,
+    "eGFR_mLmin173m2": 0.096,
+    "Smoking_Status": 0.092,
+    "Charlson_comorbidity_index": 0.092,
+    "Time_to_CVD_mortality_days": 0.074,
+}
+SMOKING_LEVELS = ([0.0, 1.0, 2.0], [1049, 388, 383])
+DEATH_CAUSES = (["I500", "I219", "I251", "I639", "J189", "N185", "C349"], [183, 179, 164, 152, 32, 26, 22])
+ALL_CAUSE_MORTALITY_RATE = 0.378
+CVD_SHARE_OF_DEATHS = 0.894
+MIN_FOLLOW_UP_DAYS = 30
+MAX_CVD_DAYS = 5471
+DAYS_PER_YEAR = 365.25
+
+COLUMNS = [
+    "Reference_Key", "Baseline_Date", "Baseline_age_year", "Male_gender", "Systolic_blood_pressure_mmHg",
+    "Diastolic_blood_pressure_mmHg", "LDL_Cholesterol_mmolL", "eGFR_mLmin173m2", "Smoking_Status",
+    "Diabetes_mellitus", "Hypertension", "ASCVD", "Dyslipidemia", "Heart_failure", "Previous_AF_or_atrial_flutter",
+    "Charlson_comorbidity_index", "Statins_and_fibrates", "Antihypertensive_drugs", "Cardiovascular_mortality",
+    "Time_to_CVD_mortality_days", "Time_to_CVD_mortality_years", "All-cause_mortality", "Time_to_mortality_days",
+    "Time_to_mortality_years", "Date_of_Registered_Death", "Death_Cause", "Today_date",
+]
+
+
+def with_nulls(values, rate, rng):
+    values = values.astype(float)
+    values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def weighted_choice(levels, rows, rng):
+    values, counts = levels
+    return rng.choice(values, size=rows, p=np.array(counts) / sum(counts))
+
+
+def format_dates(dates):
+    # Only a few thousand distinct days occur, so format each once.
+    unique, inverse = np.unique(dates, return_inverse=True)
+    return pd.Series(unique).dt.strftime(DATE_FORMAT).to_numpy()[inverse]
+
+
+def generate_chunk(first_key, rows, rng):
+    """rows synthetic records with Reference_Key starting at first_key."""
+    baseline = BASELINE_START + rng.integers(0, (BASELINE_END - BASELINE_START).astype(int) + 1, rows)
+    censor_days = (TODAY - baseline).astype(int)
+    dead = rng.random(rows) < ALL_CAUSE_MORTALITY_RATE
+    cvd_death = dead & (rng.random(rows) < CVD_SHARE_OF_DEATHS)
+    mortality_days = np.where(dead, rng.integers(MIN_FOLLOW_UP_DAYS, censor_days), censor_days)
+    cvd_days = np.where(cvd_death, mortality_days, rng.integers(MIN_FOLLOW_UP_DAYS, np.minimum(mortality_days, MAX_CVD_DAYS) + 1))
+    cvd_days = with_nulls(cvd_days, NULL_RATES["Time_to_CVD_mortality_days"], rng)
+
+    data = {
+        "Reference_Key": np.arange(first_key, first_key + rows),
+        "Baseline_Date": format_dates(baseline),
+        "Baseline_age_year": rng.integers(40, 91, rows),
+        "Male_gender": rng.integers(0, 2, rows),
+        "Systolic_blood_pressure_mmHg": with_nulls(rng.integers(100, 201, rows), NULL_RATES["Systolic_blood_pressure_mmHg"], rng),
+        "Diastolic_blood_pressure_mmHg": with_nulls(rng.integers(60, 121, rows), NULL_RATES["Diastolic_blood_pressure_mmHg"], rng),
+        "LDL_Cholesterol_mmolL": with_nulls(rng.uniform(1.5, 7.0, rows).round(2), NULL_RATES["LDL_Cholesterol_mmolL"], rng),
+        "eGFR_mLmin173m2": with_nulls(rng.uniform(30.0, 120.0, rows).round(2), NULL_RATES["eGFR_mLmin173m2"], rng),
+        "Smoking_Status": with_nulls(weighted_choice(SMOKING_LEVELS, rows, rng), NULL_RATES["Smoking_Status"], rng),
+    }
+    for flag, rate in FLAG_RATES.items():
+        data[flag] = (rng.random(rows) < rate).astype(np.int8)
+    data["Charlson_comorbidity_index"] = with_nulls(rng.integers(0, 9, rows), NULL_RATES["Charlson_comorbidity_index"], rng)
+    data["Cardiovascular_mortality"] = cvd_death.astype(np.int8)
+    data["Time_to_CVD_mortality_days"] = cvd_days
+    data["Time_to_CVD_mortality_years"] = cvd_days / DAYS_PER_YEAR
+    data["All-cause_mortality"] = dead.astype(np.int8)
+    data["Time_to_mortality_days"] = mortality_days
+    data["Time_to_mortality_years"] = mortality_days / DAYS_PER_YEAR
+    death_dates = format_dates(baseline + mortality_days)
+    data["Date_of_Registered_Death"] = np.where(dead, death_dates, "")
+    data["Death_Cause"] = np.where(dead, weighted_choice(DEATH_CAUSES, rows, rng), "")
+    data["Today_date"] = np.full(rows, pd.Timestamp(TODAY).strftime(DATE_FORMAT))
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def generate_csv(path, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Write rows synthetic records to path, one chunk at a time."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        writer = None
+        for first in range(0, rows, chunk_rows):
+            chunk = generate_chunk(first + 1, min(chunk_rows, rows - first), rng)
+            if pa_csv is None:
+                handle.write(chunk.to_csv(index=False, header=first == 0).encode())
+                continue
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa_csv.CSVWriter(handle, table.schema, write_options=pa_csv.WriteOptions(quoting_style="none"))
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic CVD-schema CSV file.")
+    parser.add_argument("rows", type=int, help="number of rows, e.g. 10000 to 100000000")
+    parser.add_argument("-o", "--output", help="CSV path (default: benchmarks/data/cvd_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+    path = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", f"cvd_{args.rows}.csv")
+    print(generate_csv(path, args.rows, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Headless timing harness for the app's code paths on synthetic CVD data.
+
+Each case runs in a fresh process, so its peak RSS is its own. Results are
+written as JSON. They can be compared against a stored baseline, and any
+case that slowed down beyond the tolerance makes the exit status 1.
+
+    python benchmarks/run_benchmarks.py --rows 10000 100000 -o results.json
+    python benchmarks/run_benchmarks.py --rows 10000 100000 --baseline results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then reported as null
+    resource = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+import plot_engine
+from plot_engine import PlotSpec
+from generate_data import generate_csv
+from stream_stats import profile_column
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+DEFAULT_TOLERANCE = 0.25
+# Slowdowns smaller than this are timer noise, whatever the ratio.
+MIN_REGRESSION_SECONDS = 0.05
+EXPORT_FORMATS = ["png", "pdf", "svg"]
+# A dense plot, so vector exports have real work to do.
+EXPORT_SPEC = PlotSpec("Scatter Plot", "Baseline_age_year", "eGFR_mLmin173m2", "Male_gender")
+
+PLOT_CASES = {
+    "plot_histogram": PlotSpec("Histogram", "eGFR_mLmin173m2"),
+    "plot_bar_chart": PlotSpec("Bar Chart (Counts)", "Smoking_Status"),
+    "plot_pie_chart": PlotSpec("Pie Chart", "Death_Cause"),
+    "plot_box": PlotSpec("Box Plot", "Smoking_Status", "eGFR_mLmin173m2", "Male_gender"),
+    "plot_scatter": PlotSpec("Scatter Plot", "Baseline_age_year", "eGFR_mLmin173m2", "Male_gender"),
+    "plot_line": PlotSpec("Line Plot", "Baseline_age_year", "eGFR_mLmin173m2"),
+    "plot_violin": PlotSpec("Violin Plot", "Smoking_Status", "eGFR_mLmin173m2", "Male_gender"),
+    "plot_heatmap": PlotSpec("Heatmap (Correlation)"),
+    "plot_pair": PlotSpec("Pair Plot"),
+}
+# Timed as a fresh interpreter from launch to exit, so these include Python's own startup.
+STARTUP_CASES = {
+    # What multi-plotter.py imports before it can show its window.
+    "startup_window": "import runpy; runpy.run_path('multi-plotter.py')",
+    # What it then loads in the background before the first plot.
+    "startup_plotting_stack": "import plot_engine, stream_stats, matplotlib.backends.backend_tkagg",
+}
+CASES = [*STARTUP_CASES, "load_csv_parse", "load_csv_cached", *PLOT_CASES, "data_summary", *(f"save_{fmt}" for fmt in EXPORT_FORMATS), "save_all"]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def remove_cache(path):
+    try:
+        os.remove(plot_engine.cache_path_for(path))
+    except FileNotFoundError:
+        pass
+
+
+def run_case(case, path):
+    """Time one case in this (fresh) process; setup such as loading the data is not timed."""
+    if case in STARTUP_CASES:
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", STARTUP_CASES[case]], cwd=REPO_DIR, check=True)
+        # A child's ru_maxrss on Linux still counts the pages it shared with this process before exec.
+        return time.perf_counter() - started, None
+
+    if case == "load_csv_parse":
+        remove_cache(path)
+        started = time.perf_counter()
+        plot_engine.load_csv(path)
+        return time.perf_counter() - started, peak_rss_mb()
+
+    df = plot_engine.load_csv(path)
+    if case == "load_csv_cached":
+        started = time.perf_counter()
+        plot_engine.load_csv(path)
+    elif case in PLOT_CASES:
+        # What generate_plot does: render, then draw the canvas once.
+        started = time.perf_counter()
+        fig, _ = plot_engine.render_plot(df, PLOT_CASES[case])
+        fig.canvas.draw()
+    elif case == "data_summary":
+        # What the summary window's worker does for every column.
+        started = time.perf_counter()
+        for col in df.columns:
+            profile_column(df[col])
+    else:
+        fig, _ = plot_engine.render_plot(df, EXPORT_SPEC)
+        fig.canvas.draw()
+        with tempfile.TemporaryDirectory() as directory:
+            formats = EXPORT_FORMATS if case == "save_all" else [case[len('save_'):]]
+            started = time.perf_counter()
+            plot_engine.export_figure(fig, [os.path.join(directory, f"plot.{fmt}") for fmt in formats])
+            elapsed = time.perf_counter() - started
+        return elapsed, peak_rss_mb()
+    return time.perf_counter() - started, peak_rss_mb()
+
+
+def run_isolated(case, path):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_case, case, path).result()
+
+
+def dataset(rows, data_dir):
+    path = os.path.join(data_dir, f"cvd_{rows}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} rows -> {path}", file=sys.stderr)
+        generate_csv(path, rows)
+    return path
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print each case's wall time against the baseline; returns the number of regressions."""
+    previous = {(r["case"], r["rows"]): r for r in baseline["results"] if r.get("wall_s") is not None}
+    regressions = 0
+    print(f"{'case':<20} {'rows':>12} {'baseline s':>11} {'now s':>9} {'ratio':>7}", file=sys.stderr)
+    for result in results:
+        before = previous.get((result["case"], result["rows"]))
+        if before is None or result.get("wall_s") is None:
+            continue
+        ratio = result["wall_s"] / max(before["wall_s"], 1e-9)
+        flag = ""
+        if ratio > 1 + tolerance and result["wall_s"] - before["wall_s"] > MIN_REGRESSION_SECONDS:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{result['case']:<20} {result['rows']:>12,} {before['wall_s']:>11.3f} {result['wall_s']:>9.3f} {ratio:>7.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time load, plotting, summary and export on synthetic CVD data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="dataset sizes (default: 10^4 10^5 10^6)")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES, help="cases to run (default: all)")
+    parser.add_argument("--data-dir", default=os.path.join(REPO_DIR, "benchmarks", "data"), help="where generated CSVs are kept")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest is reported (default: 1)")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a case counts as a regression (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        path = dataset(rows, args.data_dir)
+        for case in args.cases:
+            result = {"case": case, "rows": rows}
+            try:
+                runs = [run_isolated(case, path) for _ in range(args.repeat)]
+                wall = min(run[0] for run in runs)
+                rss = None if runs[0][1] is None else max(run[1] for run in runs)
+                result.update(wall_s=round(wall, 4), peak_rss_mb=None if rss is None else round(rss, 1), rows_per_s=round(rows / max(wall, 1e-9)))
+            except Exception as e:
+                result.update(wall_s=None, error=str(e))
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        if regressions:
+            print(f"{regressions} case(s) slower than the baseline by more than {args.tolerance:.0%}.", file=sys.stderr)
+            return 1
+    return 1 if any(result.get("error") for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""What the column pickers know about each column, computed once per load.
+
+A ColumnIndex holds every column's kind, distinct count and null ratio, the
+column names in display order, and their case-folded forms for type-ahead
+search. The GUI filters with it on the Tk thread, so nothing here touches
+the data after the index is built.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from stream_stats import CategoryCounts
+
+
+@dataclass
+class ColumnInfo:
+    name: str
+    kind: str           # "numeric", "datetime" or "categorical"
+    distinct: int
+    null_ratio: float
+    approximate: bool = False  # distinct is an estimate (out-of-core)
+
+    def describe(self):
+        approx = "~" if self.approximate else ""
+        return f"{self.kind}, {approx}{self.distinct:,} distinct, {self.null_ratio:.1%} missing"
+
+
+def column_kind(dtype):
+    # Numeric as render_plot's require_numeric sees it, so booleans count.
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "categorical"
+
+
+class ColumnIndex:
+    """Facts about the columns of a loaded dataset, and the sorted names each plot slot may take."""
+
+    def __init__(self, infos):
+        self.infos = {info.name: info for info in infos}
+        self.names = sorted(self.infos)
+        self.folded = {name: name.casefold() for name in self.names}
+        self._accepting = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        rows = max(len(df), 1)
+        distinct, nulls = df.nunique(), df.isna().sum()
+        return cls([ColumnInfo(col, column_kind(dtype), int(distinct[col]), int(nulls[col]) / rows) for col, dtype in df.dtypes.items()])
+
+    @classmethod
+    def from_profile(cls, profile):
+        """Index of an out-of-core stream_stats.ProfileState; distinct counts there are estimates."""
+        rows = max(profile.rows, 1)
+        return cls([ColumnInfo(col, "numeric" if profile.is_numeric(col) else "categorical", profile.counts[col].distinct(),
+                               profile.nulls[col] / rows, approximate=profile.counts[col].overflow)
+                    for col in profile.columns])
+
+    def __len__(self):
+        return len(self.names)
+
+    def accepting(self, accepts):
+        """Sorted names of the columns a slot accepting accepts ("numeric" or "any") can take."""
+        if accepts == "any":
+            return self.names
+        if accepts not in self._accepting:
+            self._accepting[accepts] = [name for name in self.names if self.infos[name].kind == accepts]
+        return self._accepting[accepts]
+
+    def accepts(self, name, accepts):
+        return name in self.infos and (accepts == "any" or self.infos[name].kind == accepts)
+
+    def search(self, names, query):
+        """The names containing query, ignoring case; query must already be case-folded."""
+        if not query:
+            return names
+        folded = self.folded
+        return [name for name in names if query in folded[name]]
+
+
+class ColumnTally:
+    """Null and distinct counts of a frame's columns, extended with each batch of appended rows (follow mode).
+
+    Distinct counts stay exact up to stream_stats.CATEGORY_COUNT_LIMIT values
+    and are estimated beyond that.
+    """
+
+    def __init__(self, df):
+        self.rows = 0
+        self.nulls = dict.fromkeys(df.columns, 0)
+        self.counts = {col: CategoryCounts() for col in df.columns}
+        self.update(df)
+
+    def update(self, rows):
+        self.rows += len(rows)
+        nulls = rows.isna().sum()
+        for col, counts in self.counts.items():
+            self.nulls[col] += int(nulls[col])
+            counts.update(rows[col])
+
+    def index(self, df):
+        """ColumnIndex of df, the frame the counts now cover, with kinds taken from its dtypes."""
+        rows = max(self.rows, 1)
+        return ColumnIndex([ColumnInfo(col, column_kind(dtype), self.counts[col].distinct(), self.nulls[col] / rows,
+                                       approximate=self.counts[col].overflow)
+                            for col, dtype in df.dtypes.items()])
@@ -0,0 +1,232 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Follow mode: keep a loaded frame in step with rows appended to its CSV file.
+
+TailReader reads only the bytes added since the last poll. append_rows gives
+the new rows the dtypes load_csv chose for the frame. IncrementalAggregates
+carries the plot aggregates and the data summary over to the longer frame by
+updating them with the new rows instead of rescanning every column.
+"""
+import io
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from column_index import ColumnTally
+from perf_trace import tracer
+from plot_engine import SOURCE_OFFSET_ATTR, HistogramState
+from stream_stats import CoMoments, ProfileState
+
+FOLLOW_CHECK_BYTES = 4096
+# A poll parses at most this much; the rest of a larger append is left for the next poll.
+FOLLOW_MAX_READ_BYTES = 64 * 2**20
+# render_plot memo names that can be updated from appended rows. Box and violin
+# group summaries hold exact quantiles, so they are recomputed instead.
+INCREMENTAL_AGGREGATES = ("histogram", "value_counts", "corr")
+
+
+class TailReader:
+    """Reads the complete lines appended to a CSV file since byte offset.
+
+    The first and last FOLLOW_CHECK_BYTES bytes already read are kept, so a
+    file truncated or rewritten in place is told apart from one that grew.
+    When the bytes read end part-way through a line, that last row was loaded
+    as it stood, so any bytes added after it call for a reload.
+    """
+
+    def __init__(self, filepath, columns, offset):
+        self.filepath = filepath
+        self.columns = list(columns)
+        self.offset = offset
+        with open(filepath, 'rb') as handle:
+            self.marks = self.read_marks(handle)
+        self.open_row = offset > 0 and not self.marks[1].endswith(b"\n")
+
+    def read_marks(self, handle):
+        handle.seek(0)
+        head = handle.read(min(FOLLOW_CHECK_BYTES, self.offset))
+        handle.seek(max(self.offset - FOLLOW_CHECK_BYTES, 0))
+        tail = handle.read(self.offset - handle.tell())
+        return head, tail
+
+    def poll(self):
+        """('unchanged', None), ('appended', rows) or ('reload', None) when the file was truncated or rewritten.
+
+        rows are parsed as read_csv parses them, before any dtype narrowing. A
+        partly written last line is left for the next poll.
+        """
+        with open(self.filepath, 'rb') as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < self.offset or self.read_marks(handle) != self.marks:
+                return 'reload', None
+            if self.open_row and size > self.offset:
+                return 'reload', None
+            handle.seek(self.offset)
+            data = handle.read(min(size - self.offset, FOLLOW_MAX_READ_BYTES))
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return 'unchanged', None
+        try:
+            rows = pd.read_csv(io.BytesIO(data), header=None, names=self.columns)
+        except pd.errors.EmptyDataError:  # nothing but blank lines
+            rows = pd.DataFrame(columns=self.columns)
+        head, tail = self.marks
+        self.marks = ((head + data)[:FOLLOW_CHECK_BYTES], (tail + data)[-FOLLOW_CHECK_BYTES:])
+        self.offset += len(data)
+        return ('appended', rows) if len(rows) else ('unchanged', None)
+
+
+def conform_rows(rows, like):
+    """rows, parsed from CSV text, converted to the dtypes of the matching columns of like.
+
+    Categorical columns get like's categories followed by any new values.
+    Integers that do not fit like's narrowed dtype are kept wider, so
+    concatenating widens that column.
+    """
+    rows = rows.copy()
+    for col in like.columns:
+        dtype, values = like[col].dtype, rows[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            new = pd.Index(values.dropna().unique()).difference(dtype.categories)
+            rows[col] = pd.Categorical(values, categories=dtype.categories.append(new))
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                rows[col] = pd.to_datetime(values, dayfirst=True, errors='coerce')
+        elif pd.api.types.is_bool_dtype(dtype):
+            continue
+        elif pd.api.types.is_numeric_dtype(dtype):
+            values = pd.to_numeric(values, errors='coerce')
+            if pd.api.types.is_integer_dtype(dtype) and values.notna().all():
+                info = np.iinfo(dtype)
+                if len(values) == 0 or info.min <= values.min() and values.max() <= info.max:
+                    values = values.astype(dtype)
+            rows[col] = values
+    return rows
+
+
+def append_rows(df, rows):
+    """df with rows appended, and rows conformed to df's dtypes; df itself is left untouched."""
+    rows = conform_rows(rows, df)
+    grown = {col: df[col].cat.set_categories(rows[col].cat.categories) for col in df.columns
+             if isinstance(df[col].dtype, pd.CategoricalDtype) and len(rows[col].cat.categories) > len(df[col].cat.categories)}
+    if grown:
+        df = df.assign(**grown)
+    return pd.concat([df, rows], ignore_index=True), rows
+
+
+def column_values(series):
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def numeric_block(df):
+    numeric = df.select_dtypes(include=np.number)
+    return list(numeric.columns), numeric.to_numpy(dtype=float, na_value=np.nan)
+
+
+class IncrementalAggregates:
+    """Plot aggregates and column profiles of a followed frame, updated from each batch of appended rows.
+
+    An aggregate is computed in full the first time it is asked for and only
+    updated after that. A histogram whose range the new rows extend is
+    computed in full again.
+    """
+
+    def __init__(self):
+        self.states = {}
+        self.profile = None
+
+    def advance(self, df, rows, names, summarize):
+        """New values for the render_plot memo names, and column profiles if summarize, of df now ending with rows.
+
+        Returns (values, profiles). values holds only names in
+        INCREMENTAL_AGGREGATES, and profiles is None unless summarize.
+        """
+        states, values = {}, {}
+        for name in names:
+            if name[0] not in INCREMENTAL_AGGREGATES:
+                continue
+            state = self.states.get(name)
+            states[name] = state = self.build(name, df) if state is None else self.update(name, state, df, rows)
+            values[name] = self.value(name, state)
+        self.states = states
+        if not summarize:
+            # A profile that skipped some rows would be wrong; rebuild it when the summary is next wanted.
+            self.profile = None
+            return values, None
+        if self.profile is None:
+            self.profile = ProfileState({col: 'numeric' if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]) else 'categorical'
+                                         for col in df.columns})
+            self.profile.update(df)
+        else:
+            self.profile.update(rows)
+        profiles = [self.profile.column_profile(col) for col in df.columns]
+        for profile in profiles:
+            profile.dtype = str(df[profile.name].dtype)
+        return values, profiles
+
+    def build(self, name, df):
+        if name[0] == "histogram":
+            _, col, bins, log_scale = name
+            return HistogramState(column_values(df[col]), bins, log_scale)
+        if name[0] == "value_counts":
+            return df[name[1]].value_counts()
+        columns, block = numeric_block(df)
+        moments = CoMoments(columns)
+        moments.add(block)
+        return moments
+
+    def update(self, name, state, df, rows):
+        if name[0] == "histogram":
+            return state if state.add(column_values(rows[name[1]])) else self.build(name, df)
+        if name[0] == "value_counts":
+            counts = state.add(rows[name[1]].value_counts(), fill_value=0).astype(np.int64)
+            return counts.sort_values(ascending=False, kind='stable')
+        columns, block = numeric_block(rows)
+        if columns != state.columns:
+            return self.build(name, df)
+        state.add(block)
+        return state
+
+    def value(self, name, state):
+        if name[0] == "histogram":
+            return state.summary()
+        if name[0] == "corr":
+            return state.corr()
+        return state
+
+
+class FollowedFile:
+    """A frame returned by load_csv, kept in step with its file; step() is meant to run off the Tk thread."""
+
+    def __init__(self, filepath, df):
+        self.reader = TailReader(filepath, df.columns, df.attrs[SOURCE_OFFSET_ATTR])
+        self.aggregates = IncrementalAggregates()
+        self.tally = None
+
+    def step(self, df, names, summarize):
+        """Poll the file once. Returns ('unchanged', None), ('reload', None), or
+        ('appended', (longer df, rows added, aggregate values, profiles, column index)), with
+        values and profiles as IncrementalAggregates.advance gives them.
+
+        The column index is counted over the whole frame on the first append
+        only, and from the appended rows after that.
+        """
+        kind, rows = self.reader.poll()
+        if kind != 'appended':
+            return kind, None
+        with tracer.action("Follow file: append rows"):
+            with tracer.span("append"):
+                df, rows = append_rows(df, rows)
+            with tracer.span("update aggregates"):
+                values, profiles = self.aggregates.advance(df, rows, names, summarize)
+            with tracer.span("index columns"):
+                if self.tally is None:
+                    self.tally = ColumnTally(df)
+                else:
+                    self.tally.update(rows)
+                index = self.tally.index(df)
+        return kind, (df, len(rows), values, profiles, index)
@@ -1,14 +1,26 @@
 #Developed by ODAT project
 #please see https://odat.info
 #please see https://github.com/ODAT-Project
+import time
+
+STARTED_AT = time.perf_counter()
+
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
-import io
+from numbers import Integral, Real
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+
+# pandas, matplotlib and seaborn are not imported here: they load on a worker
+# thread once the window is up, and each method imports what it needs from them.
+from plot_types import PLOT_TYPES, COLUMN_SLOTS
+from perf_trace import tracer
 
 STYLE_CONFIG = {
     "font_family": "Segoe UI",
@@ -26,6 +38,257 @@ STYLE_CONFIG = {
     "disabled_bg": "#E0E0E0",
 }
 
+LOAD_POLL_MS = 100
+REAGGREGATE_DEBOUNCE_MS = 150
+EXPORT_DPI = 300
+BATCH_EXPORT_FORMATS = ["png", "pdf", "svg"]
+PLOTTING_STACK_MODULES = ["plot_engine", "stream_stats", "matplotlib.backends.backend_tkagg"]
+COLUMN_WHEEL_ROWS = 3
+FOLLOW_POLL_MS = 2000
+
+
+def import_plotting_stack():
+    """Import the scientific stack and the modules built on it; returns the seconds it took."""
+    started = time.perf_counter()
+    for name in PLOTTING_STACK_MODULES:
+        importlib.import_module(name)
+    return time.perf_counter() - started
+
+
+def traced(name, func):
+    """func(job) run as one tracer action, on whichever thread calls it."""
+    def run(job):
+        with tracer.action(name):
+            return func(job)
+    return run
+
+
+class BackgroundJob(threading.Thread):
+    """Runs func(job) off the Tk thread; func reports through the job's queue and polls its cancel flag."""
+
+    def __init__(self, func, on_done):
+        super().__init__(daemon=True)
+        self.func = func
+        self.on_done = on_done
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report_progress(self, *progress):
+        self.messages.put(("progress", progress))
+
+    def report_stage(self, text):
+        self.messages.put(("stage", text))
+
+    def run(self):
+        try:
+            result = self.func(self)
+            self.messages.put(("cancelled", None) if result is None else ("done", result))
+        except Exception as e:
+            self.messages.put(("error", e))
+
+class ExportProcess:
+    """A spawned process that writes figures to disk, so a slow export never blocks the app.
+
+    It starts on the first export and stays up for the next ones; cancelling an export kills it.
+    """
+
+    def __init__(self):
+        self.process = None
+        self.tasks = None
+        self.events = None
+        self.task_id = 0
+
+    def export(self, data, paths, dpi, job):
+        """Write the pickled figure data to paths, relaying progress to job; returns None if job is cancelled."""
+        if self.process is None or not self.process.is_alive():
+            from plot_engine import export_worker
+            job.report_stage("Starting the export process...")
+            context = multiprocessing.get_context("spawn")
+            self.tasks, self.events = context.Queue(), context.Queue()
+            self.process = context.Process(target=export_worker, args=(self.tasks, self.events), daemon=True)
+            self.process.start()
+        self.task_id += 1
+        self.tasks.put((self.task_id, data, paths, dpi, (tracer.enabled, tracer.profile_actions)))
+        writing = None
+        while True:
+            if job.cancel_event.is_set():
+                self.stop()
+                # The file being written when the process was killed is incomplete.
+                if writing is not None and os.path.exists(writing):
+                    os.remove(writing)
+                return None
+            try:
+                task_id, kind, payload = self.events.get(timeout=LOAD_POLL_MS / 1000)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError("The export process exited unexpectedly.")
+                continue
+            if task_id != self.task_id:
+                continue
+            if kind == "progress":
+                done, total, writing = payload
+                job.report_stage(f"Writing {os.path.basename(writing)} ({done + 1} of {total})...")
+            elif kind == "error":
+                raise RuntimeError(payload)
+            else:
+                paths, record = payload
+                tracer.attach(record)
+                return paths
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process = None
+
+
+class ColumnPicker(ttk.Frame):
+    """A column list with type-ahead search whose listbox only ever holds the rows in view.
+
+    Filling a Tk listbox with thousands of names is slow, so the listbox shows
+    one screenful of the matching columns and its scrollbar moves that window.
+    """
+    NONE_LABEL = "(none)"
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+        font_bold = (STYLE_CONFIG["font_family"], STYLE_CONFIG["font_size_normal"], "bold")
+        self.label = ttk.Label(self, font=font_bold)
+        self.label.grid(row=0, column=0, columnspan=2, sticky="w")
+        self.query_var = tk.StringVar()
+        self.entry = ttk.Entry(self, textvariable=self.query_var)
+        self.entry.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 2))
+        self.listbox = tk.Listbox(self, exportselection=False, height=4, activestyle="none", selectbackground=STYLE_CONFIG["listbox_select_bg"], selectforeground=STYLE_CONFIG["listbox_select_fg"])
+        self.listbox.grid(row=2, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.scroll)
+        self.scrollbar.grid(row=2, column=1, sticky="ns")
+        self.info_label = ttk.Label(self, text="", wraplength=280)
+        self.info_label.grid(row=3, column=0, columnspan=2, sticky="ew")
+
+        self.index = None
+        self.accepts = "any"
+        self.optional = False
+        self.selected = None
+        self.matches = []
+        self.items = []
+        self.query = None  # the search text self.matches were filtered with; None forces a full search
+        self.top = 0
+        self.rows = 4
+        line = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace")
+        self.row_height = line + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+
+        self.query_var.trace_add("write", lambda *args: self.search())
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<Configure>", self.on_resize)
+        for widget in (self.listbox, self.entry):
+            widget.bind("<Up>", lambda e: self.move(-1))
+            widget.bind("<Down>", lambda e: self.move(1))
+            widget.bind("<Prior>", lambda e: self.move(-self.rows))
+            widget.bind("<Next>", lambda e: self.move(self.rows))
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll("scroll", -COLUMN_WHEEL_ROWS if e.delta > 0 else COLUMN_WHEEL_ROWS, "units"))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll("scroll", -COLUMN_WHEEL_ROWS, "units"))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll("scroll", COLUMN_WHEEL_ROWS, "units"))
+
+    def configure_slot(self, label, accepts, optional):
+        self.label.config(text=label)
+        self.accepts, self.optional = accepts, optional
+        self.refresh()
+
+    def set_index(self, index):
+        self.index = index
+        self.refresh()
+
+    def refresh(self):
+        if self.index is None or not self.index.accepts(self.selected, self.accepts):
+            self.selected = None
+        self.query = None
+        self.search()
+
+    def get(self):
+        return self.selected
+
+    def search(self):
+        """Narrow the list to the search text; text that extends the last search only filters its matches."""
+        query = self.query_var.get().strip().casefold()
+        if self.index is None:
+            self.matches = []
+        else:
+            narrowing = self.query is not None and query.startswith(self.query)
+            self.matches = self.index.search(self.matches if narrowing else self.index.accepting(self.accepts), query)
+        self.query = query
+        self.items = ([None] if self.optional and not query else []) + self.matches
+        self.top = 0
+        if self.selected in self.items:
+            self.reveal(self.items.index(self.selected))
+        self.render()
+
+    def render(self):
+        window = self.items[self.top:self.top + self.rows]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *(self.NONE_LABEL if name is None else name for name in window))
+        if self.selected in window:
+            self.listbox.selection_set(window.index(self.selected))
+        total = len(self.items)
+        self.scrollbar.set(*((self.top / total, min(self.top + self.rows, total) / total) if total else (0, 1)))
+        self.show_info()
+
+    def show_info(self):
+        if self.index is None:
+            text = ""
+        elif self.selected is not None:
+            text = self.index.infos[self.selected].describe()
+        else:
+            text = f"{len(self.matches):,} of {len(self.index.accepting(self.accepts)):,} columns"
+        self.info_label.config(text=text)
+
+    def reveal(self, position):
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + self.rows:
+            self.top = position - self.rows + 1
+
+    def scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            top = round(float(amount) * len(self.items))
+        else:
+            top = self.top + int(amount) * (self.rows if unit == "pages" else 1)
+        top = max(0, min(top, len(self.items) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.items[self.top + selection[0]]
+            self.show_info()
+
+    def move(self, step):
+        if self.items:
+            if self.selected in self.items:
+                position = self.items.index(self.selected) + step
+            else:
+                position = 0 if step > 0 else len(self.items) - 1
+            position = max(0, min(position, len(self.items) - 1))
+            self.selected = self.items[position]
+            self.reveal(position)
+            self.render()
+        return "break"
+
+    def on_resize(self, event):
+        inset = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        rows = max(1, (event.height - inset) // self.row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, len(self.items) - self.rows))
+            self.render()
+
+
 class EnhancedCSVPlotterApp:
     def __init__(self, root):
         self.root = root
@@ -36,15 +299,49 @@ class EnhancedCSVPlotterApp:
 
         self.df = None
         self.current_fig = None
+        self.current_key = None
         self.filename = ""
+        self.filepath = ""
+        self.profile = None
+        self.background_job = None
+        self.job_started_at = None
+        self.out_of_core_var = tk.BooleanVar(value=False)
+        self.follow_var = tk.BooleanVar(value=False)
+        self.followed = None
+        self.follow_after_id = None
+        self.follow_future = None
+        self.canvas = None
+        self.aggregated_view = None
+        self.plot_container = None
+        self.sorted_index_cache = {}
+        self.column_index = None
+        self.plot_cache = None
+        self.stack_ready = False
+        self.window_ready_s = None
+        self.stack_import_s = None
+        self.fingerprint = None
+        self.summary_profiles = {}
+        self.summary_job = None
+        self.summary_views = []
+        self.reaggregate_executor = ThreadPoolExecutor(max_workers=1)
+        self.export_process = ExportProcess()
+        self.reaggregate_after_id = None
+        self.reaggregate_generation = 0
+        self.reaggregate_request = None
         self.plot_type = tk.StringVar(value="Histogram")
         self.log_scale_var = tk.BooleanVar(value=False)
         self.hist_bins_var = tk.StringVar(value="30")
+        self.pair_grid = None
+        self.pair_page = 0
+        self.pair_page_var = tk.StringVar(value="")
+        self.trace_var = tk.BooleanVar(value=False)
+        self.profile_actions_var = tk.BooleanVar(value=False)
         
         self.setup_styles()
         self.create_menu()
         self.create_main_layout()
         self.toggle_button_states() # Initial state
+        self.root.after_idle(self.start_stack_import)
 
     def setup_styles(self):
         s = ttk.Style(self.root)
@@ -101,29 +398,55 @@ class EnhancedCSVPlotterApp:
         file_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
         file_frame.columnconfigure(0, weight=1)
         
-        load_button = ttk.Button(file_frame, text="Load CSV File", command=self.load_csv)
-        load_button.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        self.load_button = ttk.Button(file_frame, text="Load CSV File", command=self.load_csv)
+        self.load_button.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
         self.file_label = ttk.Label(file_frame, text="No file loaded.", wraplength=280)
         self.file_label.grid(row=1, column=0, sticky="ew", padx=5, pady=(0, 5))
         self.summary_button = ttk.Button(file_frame, text="Show Data Summary", command=self.show_data_summary)
         self.summary_button.grid(row=2, column=0, sticky="ew", padx=5, pady=(0, 5))
+        ttk.Checkbutton(file_frame, text="Out-of-core mode (files larger than memory)", variable=self.out_of_core_var).grid(row=3, column=0, sticky="w", padx=5, pady=(0, 5))
+
+        self.load_progress_frame = ttk.Frame(file_frame, style="Content.TFrame")
+        ttk.Checkbutton(file_frame, text="Follow file (add rows appended to it)", variable=self.follow_var, command=self.toggle_follow).grid(row=4, column=0, sticky="w", padx=5, pady=(0, 5))
+        self.load_progress_frame.grid(row=5, column=0, sticky="ew", padx=5, pady=(0, 5))
+        self.load_progress_frame.columnconfigure(0, weight=1)
+        self.load_progress = ttk.Progressbar(self.load_progress_frame, mode='determinate')
+        self.load_progress.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        ttk.Button(self.load_progress_frame, text="Cancel", command=self.cancel_background_job).grid(row=0, column=1)
+        self.load_status_label = ttk.Label(self.load_progress_frame, text="", wraplength=280)
+        self.load_status_label.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(2, 0))
+        self.load_progress_frame.grid_remove()
+        self.stack_status_label = ttk.Label(file_frame, text="Loading plotting libraries...", wraplength=280)
+        self.stack_status_label.grid(row=6, column=0, sticky="ew", padx=5, pady=(0, 5))
 
         plot_config_frame = ttk.LabelFrame(parent, text="Plot Configuration")
         plot_config_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=5)
         plot_config_frame.columnconfigure(1, weight=1)
         
         ttk.Label(plot_config_frame, text="Plot Type:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        plot_options = ["Histogram", "Bar Chart (Counts)", "Pie Chart", "Box Plot", "Scatter Plot", "Line Plot", "Violin Plot", "Heatmap (Correlation)", "Pair Plot"]
-        self.plot_combo = ttk.Combobox(plot_config_frame, textvariable=self.plot_type, values=plot_options, state='readonly')
+        self.plot_combo = ttk.Combobox(plot_config_frame, textvariable=self.plot_type, values=PLOT_TYPES, state='readonly')
         self.plot_combo.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
         self.plot_combo.bind("<<ComboboxSelected>>", self.update_column_selection_ui)
         
         self.column_selection_frame = ttk.LabelFrame(parent, text="Column Selection")
         self.column_selection_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        self.column_selection_frame.columnconfigure(0, weight=1)
         parent.rowconfigure(2, weight=1)
+        self.column_pickers = [ColumnPicker(self.column_selection_frame) for _ in range(3)]
+        for row, picker in enumerate(self.column_pickers):
+            picker.grid(row=row, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        self.all_columns_label = ttk.Label(self.column_selection_frame, wraplength=280)
+        self.all_columns_label.grid(row=3, column=0, sticky="ew", padx=5, pady=10)
 
         self.plot_options_frame = ttk.LabelFrame(parent, text="Plot Customization")
         self.plot_options_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=5)
+        self.plot_options_frame.columnconfigure(0, weight=1)
+        self.plot_option_frames = {}
+        for plot, setup in (("Histogram", self.setup_hist_options), ("Scatter Plot", self.setup_scatter_options), ("Pair Plot", self.setup_pair_options)):
+            frame = ttk.Frame(self.plot_options_frame)
+            frame.grid(row=0, column=0, sticky="ew")
+            setup(frame)
+            self.plot_option_frames[plot] = frame
 
         action_frame = ttk.LabelFrame(parent, text="Actions")
         action_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=10)
@@ -134,229 +457,498 @@ class EnhancedCSVPlotterApp:
         self.generate_button.grid(row=0, column=0, sticky="ew", padx=(5,2), pady=5)
         self.save_button = ttk.Button(action_frame, text="Save Plot", command=self.save_plot)
         self.save_button.grid(row=0, column=1, sticky="ew", padx=(2,5), pady=5)
+        self.batch_export_button = ttk.Button(action_frame, text="Export PNG + PDF + SVG...", command=self.batch_export_plot)
+        self.batch_export_button.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
+
+        perf_frame = ttk.LabelFrame(parent, text="Performance")
+        perf_frame.grid(row=5, column=0, sticky="ew", padx=10, pady=(0, 10))
+        perf_frame.columnconfigure(0, weight=1)
+        ttk.Checkbutton(perf_frame, text="Record timings", variable=self.trace_var, command=self.toggle_tracing).grid(row=0, column=0, sticky="w", padx=5, pady=2)
+
+        self.perf_details_frame = ttk.Frame(perf_frame, style="Content.TFrame")
+        self.perf_details_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=(0, 5))
+        self.perf_details_frame.columnconfigure(0, weight=1)
+        self.perf_details_frame.columnconfigure(1, weight=1)
+        ttk.Checkbutton(self.perf_details_frame, text="Profile each action (cProfile)", variable=self.profile_actions_var, command=self.toggle_tracing).grid(row=0, column=0, columnspan=2, sticky="w", pady=2)
+        self.perf_text = scrolledtext.ScrolledText(self.perf_details_frame, height=7, width=36, wrap=tk.NONE, font=("Courier New", 9))
+        self.perf_text.grid(row=1, column=0, columnspan=2, sticky="ew", pady=2)
+        self.perf_text.config(state=tk.DISABLED)
+        ttk.Button(self.perf_details_frame, text="Export Trace...", command=self.export_trace).grid(row=2, column=0, sticky="ew", padx=(0, 2), pady=2)
+        ttk.Button(self.perf_details_frame, text="Save Profile...", command=self.save_profile).grid(row=2, column=1, sticky="ew", padx=(2, 0), pady=2)
+        self.perf_details_frame.grid_remove()
 
         self.update_column_selection_ui()
     
     def toggle_button_states(self):
         """Enable or disable buttons based on application state."""
-        data_loaded = self.df is not None
+        data_loaded = self.df is not None or self.profile is not None
         plot_exists = self.current_fig is not None
+        busy = self.background_job is not None
 
+        self.load_button.config(state=tk.DISABLED if busy else tk.NORMAL)
         self.summary_button.config(state=tk.NORMAL if data_loaded else tk.DISABLED)
-        self.generate_button.config(state=tk.NORMAL if data_loaded else tk.DISABLED)
-        self.save_button.config(state=tk.NORMAL if plot_exists else tk.DISABLED)
+        self.generate_button.config(state=tk.NORMAL if data_loaded and not busy else tk.DISABLED)
+        self.save_button.config(state=tk.NORMAL if plot_exists and not busy else tk.DISABLED)
+        self.batch_export_button.config(state=tk.NORMAL if plot_exists and not busy else tk.DISABLED)
 
 
     def update_column_selection_ui(self, event=None):
-        for widget in self.column_selection_frame.winfo_children():
-            widget.destroy()
-        for widget in self.plot_options_frame.winfo_children():
-            widget.destroy()
-
+        """Point the column pickers and plot options at the chosen plot type; the widgets themselves are kept."""
         plot = self.plot_type.get()
-        self.column_selection_frame.columnconfigure(0, weight=1)
+        slots = COLUMN_SLOTS.get(plot, [])
+        for row, picker in enumerate(self.column_pickers):
+            if row < len(slots):
+                picker.configure_slot(*slots[row])
+                picker.grid()
+            else:
+                picker.grid_remove()
+            self.column_selection_frame.rowconfigure(row, weight=1 if row < len(slots) else 0)
+        if slots:
+            self.all_columns_label.grid_remove()
+        else:
+            self.all_columns_label.config(text=f"{plot} will be generated for all numerical columns.")
+            self.all_columns_label.grid()
+        for option_plot, frame in self.plot_option_frames.items():
+            if option_plot == plot:
+                frame.grid()
+            else:
+                frame.grid_remove()
 
-        font_bold = (STYLE_CONFIG["font_family"], STYLE_CONFIG["font_size_normal"], "bold")
+    def setup_hist_options(self, frame):
+        frame.columnconfigure(1, weight=1)
+        ttk.Checkbutton(frame, text="Logarithmic Scale (X-axis)", variable=self.log_scale_var).grid(row=0, column=0, sticky='w', padx=5, pady=2)
+        ttk.Label(frame, text="Number of Bins:").grid(row=1, column=0, sticky='w', padx=5, pady=2)
+        ttk.Entry(frame, textvariable=self.hist_bins_var, width=10).grid(row=1, column=1, sticky='w', padx=5, pady=2)
 
-        if plot in ["Histogram", "Bar Chart (Counts)", "Pie Chart"]:
-            ttk.Label(self.column_selection_frame, text="Select Column:", font=font_bold).pack(fill=tk.X, padx=5, pady=5)
-            self.col1_listbox = tk.Listbox(self.column_selection_frame, exportselection=False, height=8, selectbackground=STYLE_CONFIG["listbox_select_bg"], selectforeground=STYLE_CONFIG["listbox_select_fg"])
-            self.col1_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-            if plot == 'Histogram':
-                self.setup_hist_options()
-        
-        elif plot in ["Scatter Plot", "Line Plot", "Box Plot", "Violin Plot"]:
-            self.column_selection_frame.rowconfigure(1, weight=1)
-            self.column_selection_frame.rowconfigure(3, weight=1)
-            
-            ttk.Label(self.column_selection_frame, text="X-Axis Column:", font=font_bold).grid(row=0, column=0, sticky="w", padx=5)
-            self.col1_listbox = tk.Listbox(self.column_selection_frame, exportselection=False, height=4, selectbackground=STYLE_CONFIG["listbox_select_bg"], selectforeground=STYLE_CONFIG["listbox_select_fg"])
-            self.col1_listbox.grid(row=1, column=0, sticky="nsew", padx=5, pady=(0, 5))
-            
-            ttk.Label(self.column_selection_frame, text="Y-Axis Column:", font=font_bold).grid(row=2, column=0, sticky="w", padx=5)
-            self.col2_listbox = tk.Listbox(self.column_selection_frame, exportselection=False, height=4, selectbackground=STYLE_CONFIG["listbox_select_bg"], selectforeground=STYLE_CONFIG["listbox_select_fg"])
-            self.col2_listbox.grid(row=3, column=0, sticky="nsew", padx=5, pady=(0, 5))
-            
-            if plot in ["Scatter Plot", "Violin Plot", "Box Plot"]:
-                ttk.Label(self.column_selection_frame, text="Color (Hue) Column (Optional):", font=font_bold).grid(row=4, column=0, sticky="w", padx=5)
-                self.col3_listbox = tk.Listbox(self.column_selection_frame, exportselection=False, height=4, selectbackground=STYLE_CONFIG["listbox_select_bg"], selectforeground=STYLE_CONFIG["listbox_select_fg"])
-                self.col3_listbox.grid(row=5, column=0, sticky="nsew", padx=5, pady=(0, 5))
-                self.column_selection_frame.rowconfigure(5, weight=1)
-            if plot == 'Scatter Plot':
-                self.setup_scatter_options()
-
-        elif plot in ["Heatmap (Correlation)", "Pair Plot"]:
-            ttk.Label(self.column_selection_frame, text=f"{plot} will be generated for all numerical columns.", wraplength=280).pack(fill=tk.X, padx=5, pady=10)
-
-        self.populate_listboxes()
-
-    def setup_hist_options(self):
-        self.plot_options_frame.columnconfigure(1, weight=1)
-        ttk.Checkbutton(self.plot_options_frame, text="Logarithmic Scale (X-axis)", variable=self.log_scale_var).grid(row=0, column=0, sticky='w', padx=5, pady=2)
-        ttk.Label(self.plot_options_frame, text="Number of Bins:").grid(row=1, column=0, sticky='w', padx=5, pady=2)
-        ttk.Entry(self.plot_options_frame, textvariable=self.hist_bins_var, width=10).grid(row=1, column=1, sticky='w', padx=5, pady=2)
-        
-    def setup_scatter_options(self):
-        ttk.Checkbutton(self.plot_options_frame, text="Logarithmic Scale (X & Y axes)", variable=self.log_scale_var).grid(row=0, column=0, sticky='w', padx=5, pady=2)
+    def setup_scatter_options(self, frame):
+        ttk.Checkbutton(frame, text="Logarithmic Scale (X & Y axes)", variable=self.log_scale_var).grid(row=0, column=0, sticky='w', padx=5, pady=2)
+
+    def setup_pair_options(self, frame):
+        frame.columnconfigure(1, weight=1)
+        ttk.Button(frame, text="< Previous Page", command=lambda: self.show_pair_page(self.pair_page - 1)).grid(row=0, column=0, sticky='ew', padx=5, pady=2)
+        ttk.Button(frame, text="Next Page >", command=lambda: self.show_pair_page(self.pair_page + 1)).grid(row=0, column=1, sticky='ew', padx=5, pady=2)
+        ttk.Label(frame, textvariable=self.pair_page_var).grid(row=1, column=0, columnspan=2, sticky='w', padx=5, pady=2)
+
+    def start_stack_import(self):
+        """Runs once the window is up: time that, then load the plotting libraries without blocking the window."""
+        self.window_ready_s = time.perf_counter() - STARTED_AT
+        job = BackgroundJob(lambda job: import_plotting_stack(), None)
+        job.start()
+        self.root.after(LOAD_POLL_MS, self.poll_stack_import, job)
+
+    def poll_stack_import(self, job):
+        try:
+            kind, payload = job.messages.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self.poll_stack_import, job)
+            return
+        if kind == "error":
+            self.stack_status_label.config(text="Plotting libraries failed to load.")
+            messagebox.showerror("Startup Error", f"Failed to load the plotting libraries: {payload}")
+            return
+        self.stack_ready = True
+        self.stack_import_s = payload
+        self.stack_status_label.config(text=f"Ready. Window shown in {self.window_ready_s:.2f} s, plotting libraries loaded in {payload:.2f} s more.")
 
     def load_csv(self):
+        if self.background_job is not None:
+            return
         filepath = filedialog.askopenfilename(initialdir=".", title="Select a CSV File", filetypes=(("CSV Files", "*.csv"), ("All files", "*.*")))
         if filepath:
+            self.start_csv_load(filepath)
+
+    def start_csv_load(self, filepath, announce=True):
+        """Read filepath, or in out-of-core mode profile it in one streaming pass, on a worker thread."""
+        out_of_core = self.out_of_core_var.get()
+
+        def read(job):
+            if not self.stack_ready:
+                # Importing waits for the startup import already in progress.
+                job.report_stage("Loading plotting libraries...")
+            if out_of_core:
+                from stream_stats import profile_file
+                return profile_file(filepath, on_progress=job.report_progress, is_cancelled=job.cancel_event.is_set)
+            from plot_engine import load_csv
+            from column_index import ColumnIndex
+            from follow import FollowedFile
+            df = load_csv(filepath, on_progress=job.report_progress, on_stage=job.report_stage, is_cancelled=job.cancel_event.is_set)
+            with tracer.span("index columns"):
+                index = ColumnIndex.from_frame(df)
+            return df, FollowedFile(filepath, df), index
+
+        func = traced("Profile CSV (out-of-core)" if out_of_core else "Load CSV", read)
+        self.start_background_job(func, lambda kind, payload: self.finish_csv_load(filepath, out_of_core, kind, payload, announce))
+
+    def start_background_job(self, func, on_done):
+        """Run func on a worker thread, showing its progress until on_done(kind, payload) is called."""
+        self.background_job = BackgroundJob(func, on_done)
+        self.job_started_at = time.perf_counter()
+        self.load_progress.config(value=0, maximum=1)
+        self.load_status_label.config(text="Starting...")
+        self.load_progress_frame.grid()
+        self.toggle_button_states()
+        self.background_job.start()
+        self.root.after(LOAD_POLL_MS, self.poll_background_job)
+
+    def cancel_background_job(self):
+        if self.background_job is not None:
+            self.background_job.cancel()
+            self.load_status_label.config(text="Cancelling...")
+
+    def poll_background_job(self):
+        job = self.background_job
+        while True:
             try:
-                self.df = pd.read_csv(filepath)
-                self.filename = filepath.split('/')[-1]
-                self.file_label.config(text=self.filename)
-                self.populate_listboxes()
+                kind, payload = job.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.show_load_progress(*payload)
+            elif kind == "stage":
+                self.load_status_label.config(text=payload)
+            else:
+                self.background_job = None
+                self.load_progress_frame.grid_remove()
+                try:
+                    job.on_done(kind, payload)
+                finally:
+                    self.toggle_button_states()
+                    self.refresh_performance_panel()
+                return
+        self.root.after(LOAD_POLL_MS, self.poll_background_job)
+
+    def show_load_progress(self, bytes_read, total_bytes, rows):
+        elapsed = max(time.perf_counter() - self.job_started_at, 1e-6)
+        mb_read = bytes_read / 1e6
+        self.load_progress.config(maximum=max(total_bytes, 1), value=bytes_read)
+        self.load_status_label.config(
+            text=f"{rows:,} rows | {mb_read:,.1f} / {total_bytes / 1e6:,.1f} MB | "
+                 f"{mb_read / elapsed:,.1f} MB/s, {rows / elapsed:,.0f} rows/s")
+
+    def finish_csv_load(self, filepath, out_of_core, kind, payload, announce=True):
+        if kind == "done":
+            from plot_engine import PlotCache, dataset_fingerprint
+            from column_index import ColumnIndex
+            # The checkbox may have been toggled since the load started.
+            if out_of_core:
+                self.df, self.profile, self.followed = None, payload, None
+                index = ColumnIndex.from_profile(payload)
+            else:
+                (self.df, self.followed, index), self.profile = payload, None
+            self.filepath = filepath
+            self.fingerprint = dataset_fingerprint(filepath, len(self.df) if self.profile is None else self.profile.rows)
+            self.clear_plot_frame()
+            if self.plot_cache is None:
+                self.plot_cache = PlotCache()
+            self.plot_cache.clear()
+            if self.summary_job is not None:
+                self.summary_job.cancel()
+                self.summary_job = None
+            self.sorted_index_cache = {}
+            self.pair_grid = None
+            self.pair_page_var.set("")
+            self.filename = filepath.split('/')[-1]
+            self.file_label.config(text=self.filename + (" (out-of-core)" if self.profile is not None else ""))
+            self.set_column_index(index)
+            if self.fingerprint in self.summary_profiles:
+                # Reloading an unchanged file keeps its summary; finish the profiling the reload cancelled.
+                self.start_summary_job()
+            if announce:
                 messagebox.showinfo("Success", "CSV file loaded successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load file: {e}")
-                self.df = None
-                self.filename = ""
-                self.file_label.config(text="No file loaded.")
-            finally:
-                self.toggle_button_states()
-
-
-    def populate_listboxes(self):
-        if self.df is not None:
-            columns = sorted(self.df.columns.tolist())
-            listboxes = ['col1_listbox', 'col2_listbox', 'col3_listbox']
-            for lb_name in listboxes:
-                if hasattr(self, lb_name):
-                    lb = getattr(self, lb_name)
-                    lb.delete(0, tk.END)
-                    for col in columns:
-                        lb.insert(tk.END, col)
-    
-    def get_selected_from_listbox(self, listbox, allow_none=False):
-        if not hasattr(self, listbox):
-            return None
-        lb = getattr(self, listbox)
-        indices = lb.curselection()
-        if indices:
-            return lb.get(indices[0])
-        if allow_none:
-            return None
-        raise IndexError("No selection made in a required listbox.")
+            self.schedule_follow()
+        elif kind == "error":
+            messagebox.showerror("Error", f"Failed to load file: {payload}")
+            self.df = None
+            self.profile = None
+            self.followed = None
+            self.set_column_index(None)
+            self.filename = ""
+            self.file_label.config(text="No file loaded.")
+
+    def toggle_follow(self):
+        if self.follow_var.get() and self.profile is not None:
+            messagebox.showwarning("Warning", "Follow mode keeps the data in memory, so it is not available in out-of-core mode.")
+            self.follow_var.set(False)
+            return
+        self.schedule_follow()
+
+    def schedule_follow(self):
+        if self.follow_var.get() and self.followed is not None and self.follow_after_id is None and self.follow_future is None:
+            self.follow_after_id = self.root.after(FOLLOW_POLL_MS, self.start_follow_step)
+
+    def start_follow_step(self):
+        """Check the file for appended rows on a worker thread, passing it the cached aggregates to update."""
+        self.follow_after_id = None
+        if not self.follow_var.get() or self.followed is None:
+            return
+        if self.background_job is not None:
+            self.schedule_follow()
+            return
+        followed, fingerprint = self.followed, self.fingerprint
+        names = [key[1:] for key in self.plot_cache.keys() if key[0] == fingerprint]
+        summarize = fingerprint in self.summary_profiles
+        self.follow_future = self.reaggregate_executor.submit(followed.step, self.df, names, summarize)
+        self.root.after(LOAD_POLL_MS, self.poll_follow_step, self.follow_future, followed)
+
+    def poll_follow_step(self, future, followed):
+        if not future.done():
+            self.root.after(LOAD_POLL_MS, self.poll_follow_step, future, followed)
+            return
+        self.follow_future = None
+        if followed is not self.followed:
+            # Another file, or a fresh load of this one, replaced the frame meanwhile; its
+            # schedule_follow found this step still running, so start following it here.
+            self.schedule_follow()
+            return
+        try:
+            kind, payload = future.result()
+        except Exception as e:
+            self.follow_var.set(False)
+            messagebox.showerror("Follow Error", f"Stopped following the file: {e}")
+            return
+        if kind == "reload" and self.background_job is None:
+            self.start_csv_load(self.filepath, announce=False)
+            return
+        if kind == "appended":
+            self.apply_appended(*payload)
+        self.schedule_follow()
+
+    def apply_appended(self, df, added, values, profiles, index):
+        """Switch to the longer frame, keep the updated aggregates under its fingerprint and redraw the plot on screen.
+
+        A plot the user has zoomed or panned keeps showing the same region. The
+        sorted column indexes are kept; the next zoom merges the new rows in.
+        """
+        from plot_engine import PlotSpec, dataset_fingerprint, value_nbytes
+        key, old = self.current_key, self.fingerprint
+        ax = self.current_fig.axes[0] if self.current_fig is not None and self.current_fig.axes else None
+        # Zooming and panning turn autoscaling off.
+        limits = (ax.get_xlim(), ax.get_ylim()) if ax is not None and not ax.get_autoscale_on() else None
+        self.df = df
+        self.fingerprint = dataset_fingerprint(self.filepath, len(df))
+        self.clear_plot_frame()
+        self.plot_cache.clear()
+        self.pair_grid = None
+        self.set_column_index(index)
+        for name, value in values.items():
+            self.plot_cache.put((self.fingerprint,) + name, value, value_nbytes(value))
+        if self.summary_job is not None:
+            self.summary_job.cancel()
+            self.summary_job = None
+        if self.summary_profiles.pop(old, None) is not None:
+            # A summary opened after this step started gets no profiles from it; profile the longer frame afresh.
+            self.summary_profiles[self.fingerprint] = profiles if profiles is not None else []
+            for i, view in enumerate(self.summary_views):
+                if view[0] == old and view[1].winfo_exists():
+                    self.summary_views[i] = view = (self.fingerprint,) + view[1:]
+                    self.write_summary(view[1])
+                    self.show_summary_status(view)
+            self.start_summary_job()
+        self.file_label.config(text=f"{self.filename} (following: +{added:,} rows, {len(df):,} in all)")
+        if key is None:
+            return
+        try:
+            self.plot_spec(PlotSpec(*key[1:]))
+            if limits is not None and self.current_fig.axes:
+                # An aggregated view re-bins for these limits through its xlim_changed callback.
+                self.current_fig.axes[0].set_xlim(limits[0])
+                self.current_fig.axes[0].set_ylim(limits[1])
+                self.canvas.draw_idle()
+        except Exception as e:
+            messagebox.showerror("Plotting Error", f"An error occurred: {e}")
+        finally:
+            self.toggle_button_states()
+            self.refresh_performance_panel()
+
+    def set_column_index(self, index):
+        self.column_index = index
+        for picker in self.column_pickers:
+            picker.set_index(index)
 
     def clear_plot_frame(self):
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
+        """Take the current plot off screen; its canvas stays alive in the plot cache until evicted."""
+        if self.plot_container is not None and self.plot_container.winfo_exists():
+            self.plot_container.pack_forget()
+        if self.reaggregate_after_id is not None:
+            self.root.after_cancel(self.reaggregate_after_id)
+            self.reaggregate_after_id = None
+        self.plot_container = None
         self.current_fig = None
+        self.current_key = None
+        self.canvas = None
+        self.aggregated_view = None
         self.toggle_button_states()
 
     def generate_plot(self):
-        if self.df is None:
+        if self.df is None and self.profile is None:
             messagebox.showwarning("Warning", "Please load a CSV file first.")
             return
 
+        from plot_engine import PlotError, PlotSpec
         plot_choice = self.plot_type.get()
         try:
             self.clear_plot_frame()
-            fig = plt.Figure(figsize=(8, 6), dpi=100)
-            ax = fig.add_subplot(111)
-
-            col1, col2, col3 = None, None, None
-            log_scale = self.log_scale_var.get()
-            
-            if plot_choice in ["Histogram", "Bar Chart (Counts)", "Pie Chart", "Box Plot", "Scatter Plot", "Line Plot", "Violin Plot"]:
-                col1 = self.get_selected_from_listbox('col1_listbox')
-            if plot_choice in ["Scatter Plot", "Line Plot", "Box Plot", "Violin Plot"]:
-                col2 = self.get_selected_from_listbox('col2_listbox')
-            if plot_choice in ["Scatter Plot", "Box Plot", "Violin Plot"]:
-                col3 = self.get_selected_from_listbox('col3_listbox', allow_none=True)
 
+            slots = COLUMN_SLOTS.get(plot_choice, [])
+            columns = [picker.get() for picker in self.column_pickers[:len(slots)]]
+            if any(col is None and not optional for col, (_, _, optional) in zip(columns, slots)):
+                raise IndexError("No selection made for a required column.")
+            col1, col2, col3 = columns + [None] * (3 - len(columns))
+
+            bins = 30
             if plot_choice == "Histogram":
-                if pd.api.types.is_numeric_dtype(self.df[col1]):
-                    try:
-                        bins = int(self.hist_bins_var.get())
-                    except ValueError:
-                        bins = 30
-                        messagebox.showwarning("Warning", "Invalid bin number, defaulting to 30.")
-                    sns.histplot(self.df[col1], kde=True, ax=ax, bins=bins, log_scale=log_scale)
-                    ax.set_title(f'Histogram of {col1}')
-                else:
-                    messagebox.showerror("Error", "Please select a numeric column for Histogram.")
-                    return
-            
-            elif plot_choice == "Bar Chart (Counts)":
-                sns.countplot(x=self.df[col1], ax=ax, order=self.df[col1].value_counts().index, palette='viridis')
-                ax.set_title(f'Distribution of {col1}')
-                ax.tick_params(axis='x', rotation=45)
-
-            elif plot_choice == "Pie Chart":
-                counts = self.df[col1].value_counts()
-                ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette('pastel'))
-                ax.set_title(f'Proportion of {col1}')
-                ax.axis('equal')
-
-            elif plot_choice in ["Box Plot", "Violin Plot"]:
-                if pd.api.types.is_numeric_dtype(self.df[col2]):
-                    plot_func = sns.boxplot if plot_choice == "Box Plot" else sns.violinplot
-                    plot_func(x=self.df[col1], y=self.df[col2], hue=self.df[col3] if col3 else None, ax=ax, palette='muted')
-                    ax.set_title(f'{plot_choice}: {col2} by {col1}')
-                    ax.tick_params(axis='x', rotation=45)
-                else:
-                    messagebox.showerror("Error", "Y-Axis must be numeric for this plot.")
-                    return
-
-            elif plot_choice in ["Scatter Plot", "Line Plot"]:
-                if pd.api.types.is_numeric_dtype(self.df[col1]) and pd.api.types.is_numeric_dtype(self.df[col2]):
-                    if plot_choice == "Scatter Plot":
-                        sns.scatterplot(x=self.df[col1], y=self.df[col2], hue=self.df[col3] if col3 else None, ax=ax)
-                        ax.set_title(f'Scatter Plot: {col2} vs {col1}')
-                        if log_scale:
-                           ax.set_xscale('log')
-                           ax.set_yscale('log')
-                    elif plot_choice == "Line Plot":
-                        sorted_df = self.df.sort_values(by=col1)
-                        sns.lineplot(x=sorted_df[col1], y=sorted_df[col2], ax=ax)
-                        ax.set_title(f'Line Plot: {col2} vs {col1}')
-                else:
-                    messagebox.showerror("Error", "Please select numeric columns for this plot.")
-                    return
-
-            elif plot_choice == "Heatmap (Correlation)":
-                numeric_df = self.df.select_dtypes(include=np.number)
-                if numeric_df.shape[1] < 2:
-                    messagebox.showerror("Error", "Need at least two numeric columns for a heatmap.")
-                    return
-                sns.heatmap(numeric_df.corr(), annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
-                ax.set_title('Correlation Heatmap')
-
-            elif plot_choice == "Pair Plot":
-                plt.close(fig) 
-                numeric_df = self.df.select_dtypes(include=np.number)
-                if numeric_df.shape[1] > 8:
-                    numeric_df = numeric_df.iloc[:, :8]
-                    messagebox.showinfo("Info", "Pair Plot limited to the first 8 numeric columns for performance.")
-                if numeric_df.shape[1] < 2:
-                    messagebox.showerror("Error", "Need at least two numeric columns for pair plot.")
-                    return
-                pair_fig = sns.pairplot(numeric_df, corner=True)
-                pair_fig.fig.suptitle('Pair Plot of Numerical Variables', y=1.02)
-                self.embed_plot(pair_fig.fig)
-                return
+                try:
+                    bins = int(self.hist_bins_var.get())
+                except ValueError:
+                    messagebox.showwarning("Warning", "Invalid bin number, defaulting to 30.")
 
-            fig.tight_layout()
-            self.embed_plot(fig)
+            self.plot_spec(PlotSpec(plot_choice, col1, col2, col3, bins, self.log_scale_var.get()))
 
         except IndexError:
              messagebox.showerror("Selection Error", "Please select the required column(s) from the list.")
+        except PlotError as e:
+            messagebox.showerror("Error", str(e))
         except Exception as e:
             messagebox.showerror("Plotting Error", f"An error occurred: {e}")
-            plt.close('all')
             self.current_fig = None
         finally:
             self.toggle_button_states()
+            self.refresh_performance_panel()
 
-    def embed_plot(self, fig):
+    def plot_spec(self, spec):
+        """Show spec for the loaded dataset, from the plot cache when it is there."""
+        from plot_engine import PairGrid, numeric_columns, plot_key, render_plot
+        if spec.plot_type == "Pair Plot" and self.profile is None:
+            if self.pair_grid is None:
+                self.pair_grid = PairGrid(self.df, numeric_columns(self.df))
+            self.show_pair_page(spec.page)
+            return
+        key = plot_key(self.fingerprint, spec)
+        if key in self.plot_cache:
+            self.show_plot(self.plot_cache.get(key), key)
+            return
+        if self.profile is not None:
+            self.generate_stream_plot(spec, key)
+            return
+        memo = lambda name, compute: self.plot_cache.memoize((self.fingerprint,) + name, compute)
+        with tracer.action(f"Generate Plot: {spec.plot_type}"):
+            fig, view = render_plot(self.df, spec, self.sorted_index_cache, memo)
+            self.embed_plot(fig, key, view)
+
+    def generate_stream_plot(self, spec, key):
+        """Plot from the out-of-core profile; a Box Plot first runs its own grouped pass over the file."""
+        from plot_engine import render_stream_plot
+        from stream_stats import grouped_box_stats
+        if spec.plot_type != "Box Plot" or None in (spec.col1, spec.col2) or not self.profile.is_numeric(spec.col2):
+            with tracer.action(f"Generate Plot: {spec.plot_type} (out-of-core)"):
+                self.embed_plot(render_stream_plot(self.profile, spec), key)
+            return
+        filepath = self.filepath
+        func = traced("Grouped pass (out-of-core)", lambda job: grouped_box_stats(filepath, spec.col1, spec.col2, spec.col3, on_progress=job.report_progress, is_cancelled=job.cancel_event.is_set))
+        self.start_background_job(func, lambda kind, payload: self.finish_stream_plot(spec, key, kind, payload))
+
+    def finish_stream_plot(self, spec, key, kind, payload):
+        from plot_engine import PlotError, render_stream_plot
+        # The dataset may have been reloaded while the grouped pass ran.
+        if key[0] != self.fingerprint:
+            return
+        if kind == "error":
+            messagebox.showerror("Plotting Error", f"An error occurred: {payload}")
+        elif kind == "done":
+            try:
+                with tracer.action(f"Generate Plot: {spec.plot_type} (out-of-core)"):
+                    self.embed_plot(render_stream_plot(self.profile, spec, payload), key)
+            except PlotError as e:
+                messagebox.showerror("Error", str(e))
+
+    def show_pair_page(self, page):
+        """Draw one page of the current pair grid; diagonal histograms are reused across pages."""
+        if self.pair_grid is None:
+            return
+        from plot_engine import PlotSpec, plot_key
+        page = max(0, min(page, self.pair_grid.page_count - 1))
+        self.clear_plot_frame()
+        self.pair_page = page
+        self.pair_page_var.set(f"Page {page + 1} of {self.pair_grid.page_count}")
+        key = plot_key(self.fingerprint, PlotSpec("Pair Plot", page=page))
+        if key in self.plot_cache:
+            self.show_plot(self.plot_cache.get(key), key)
+        else:
+            with tracer.action(f"Generate Plot: Pair Plot page {page + 1}"):
+                self.embed_plot(self.pair_grid.render(page), key)
+            self.refresh_performance_panel()
+
+    def embed_plot(self, fig, key, view=None):
+        """Give fig its own canvas and toolbar, store them in the plot cache under key and show them."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from plot_engine import figure_nbytes
+        container = ttk.Frame(self.plot_frame, style="Content.TFrame")
+        canvas = FigureCanvasTkAgg(fig, master=container)
+        with tracer.span("draw"):
+            canvas.draw()
+        with tracer.span("toolbar and packing"):
+            toolbar = NavigationToolbar2Tk(canvas, container, pack_toolbar=False)
+            toolbar.update()
+            toolbar.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        if view is not None:
+            view.ax.callbacks.connect('xlim_changed', self.schedule_reaggregate)
+            view.ax.callbacks.connect('ylim_changed', self.schedule_reaggregate)
+        plot = (container, fig, canvas, view)
+        self.plot_cache.put(key, plot, figure_nbytes(fig), release=self.release_plot)
+        self.show_plot(plot, key)
+
+    def show_plot(self, plot, key):
+        container, fig, canvas, view = plot
+        container.pack(fill=tk.BOTH, expand=True)
+        self.plot_container = container
         self.current_fig = fig
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.current_key = key
+        self.canvas = canvas
+        self.aggregated_view = view
         self.toggle_button_states()
 
+    def release_plot(self, plot):
+        container = plot[0]
+        if container is self.plot_container:
+            self.clear_plot_frame()
+        container.destroy()
+
+    def schedule_reaggregate(self, ax=None):
+        """Debounce axis-limit changes from zooming/panning into one re-aggregation."""
+        if self.reaggregate_after_id is not None:
+            self.root.after_cancel(self.reaggregate_after_id)
+        self.reaggregate_after_id = self.root.after(REAGGREGATE_DEBOUNCE_MS, self.start_reaggregate)
+
+    def start_reaggregate(self):
+        self.reaggregate_after_id = None
+        view = self.aggregated_view
+        if view is None:
+            return
+        from plot_engine import axes_pixel_size
+        request = (view, view.ax.get_xlim(), view.ax.get_ylim(), axes_pixel_size(view.ax))
+        # After Home or Back autoscaling is on, so applying a result sets the same limits
+        # again; re-binning for them would only repeat itself.
+        if request == self.reaggregate_request:
+            return
+        self.reaggregate_request = request
+        self.reaggregate_generation += 1
+        future = self.reaggregate_executor.submit(view.compute, *request[1:])
+        self.root.after(LOAD_POLL_MS, self.poll_reaggregate, future, view, self.reaggregate_generation)
+
+    def poll_reaggregate(self, future, view, generation):
+        if not future.done():
+            self.root.after(LOAD_POLL_MS, self.poll_reaggregate, future, view, generation)
+            return
+        # Drop results for a plot that has been replaced or a zoom that has been superseded.
+        if view is not self.aggregated_view or generation != self.reaggregate_generation:
+            return
+        try:
+            view.apply(future.result())
+            self.canvas.draw_idle()
+        except Exception as e:
+            messagebox.showerror("Plotting Error", f"Could not refresh the zoomed view: {e}")
+
     def save_plot(self):
         if not self.current_fig:
             messagebox.showwarning("Warning", "No plot to save. Please generate a plot first.")
@@ -376,40 +968,205 @@ class EnhancedCSVPlotterApp:
 
         if not filepath:
             return
+        self.start_export([filepath])
+
+    def batch_export_plot(self):
+        """Write the current plot as PNG, PDF and SVG side by side, sharing one layout pass."""
+        if not self.current_fig:
+            messagebox.showwarning("Warning", "No plot to save. Please generate a plot first.")
+            return
+        filepath = filedialog.asksaveasfilename(filetypes=[("All Files", "*.*")], title="Export Plot As (one file per format)")
+        if not filepath:
+            return
+        stem = os.path.splitext(filepath)[0]
+        self.start_export([f"{stem}.{fmt}" for fmt in BATCH_EXPORT_FORMATS])
 
+    def start_export(self, paths):
+        """Hand a copy of the current figure to the export process and show its progress until it is written."""
         try:
-            self.current_fig.savefig(filepath, dpi=300, bbox_inches='tight')
-            messagebox.showinfo("Success", f"Plot successfully saved to:\n{filepath}")
+            data = pickle.dumps(self.current_fig)
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save the plot.\nError: {e}")
+            return
+        func = traced("Save Plot", lambda job: self.export_process.export(data, paths, EXPORT_DPI, job))
+        self.start_background_job(func, lambda kind, payload: self.finish_export(paths, kind, payload))
+
+    def finish_export(self, paths, kind, payload):
+        if kind == "done":
+            messagebox.showinfo("Success", "Plot successfully saved to:\n" + "\n".join(paths))
+        elif kind == "error":
+            messagebox.showerror("Save Error", f"Failed to save the plot.\nError: {payload}")
+
+    def toggle_tracing(self):
+        """Recording is off by default; the instrumented code then only pays for a no-op context manager."""
+        tracer.enabled = self.trace_var.get()
+        tracer.profile_actions = self.profile_actions_var.get()
+        if tracer.enabled:
+            self.perf_details_frame.grid()
+            self.refresh_performance_panel()
+        else:
+            self.perf_details_frame.grid_remove()
+
+    def refresh_performance_panel(self):
+        """List the phases of the last recorded action with their wall time and change in resident memory."""
+        if not tracer.enabled:
+            return
+        action = tracer.last_action()
+        lines = []
+        if action is not None:
+            lines.append(f"{action.name}: {action.duration * 1000:,.1f} ms")
+            for span in action.spans[1:]:
+                line = f"{'  ' * span.depth}{span.name:<{24 - 2 * span.depth}} {span.duration * 1000:>9,.1f} ms"
+                if span.rss_before is not None and span.rss_after is not None:
+                    line += f" {span.rss_after - span.rss_before:+8.1f} MB"
+                lines.append(line)
+            if action.profile is not None:
+                lines.append("(profiled; use Save Profile...)")
+        self.perf_text.config(state=tk.NORMAL)
+        self.perf_text.delete("1.0", tk.END)
+        self.perf_text.insert(tk.END, "\n".join(lines) or "No actions recorded yet.")
+        self.perf_text.config(state=tk.DISABLED)
+
+    def export_trace(self):
+        if not tracer.actions:
+            messagebox.showwarning("Warning", "No actions recorded yet.")
+            return
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Chrome Trace (JSON)", "*.json"), ("CSV File", "*.csv")],
+            title="Export Trace As"
+        )
+        if not filepath:
+            return
+        try:
+            tracer.export(filepath)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export the trace.\nError: {e}")
+
+    def save_profile(self):
+        if tracer.last_action(profiled=True) is None:
+            messagebox.showwarning("Warning", "No profiled action yet. Turn on 'Profile each action' and repeat the action.")
+            return
+        filepath = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("cProfile Stats", "*.prof")], title="Save Profile As")
+        if not filepath:
+            return
+        try:
+            tracer.save_profile(filepath)
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save the profile.\nError: {e}")
 
     def show_data_summary(self):
-        if self.df is None: return
+        """Open the summary window at once; column profiles fill in as a worker computes them."""
+        if self.df is None and self.profile is None: return
         summary_window = tk.Toplevel(self.root)
         summary_window.title(f"Data Summary: {self.filename}")
         summary_window.geometry("700x500")
         summary_window.configure(bg=STYLE_CONFIG["bg_widget"])
 
+        status_label = ttk.Label(summary_window, text="")
+        status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
         text_area = scrolledtext.ScrolledText(summary_window, wrap=tk.WORD, font=("Courier New", 10))
         text_area.pack(padx=10, pady=10, expand=True, fill=tk.BOTH)
 
-        buffer = io.StringIO()
-        self.df.info(buf=buffer)
-        info_str = buffer.getvalue()
-        
-        summary_str = f"DATASET OVERVIEW\n"
-        summary_str += f"{'='*30}\n"
-        summary_str += info_str
-        summary_str += f"\n\nNUMERICAL DATA SUMMARY (describe())\n"
-        summary_str += f"{'='*40}\n"
-        summary_str += self.df.describe().to_string()
-        summary_str += f"\n\nCATEGORICAL DATA SUMMARY (describe())\n"
-        summary_str += f"{'='*40}\n"
-        summary_str += self.df.describe(include=['object', 'category']).to_string()
-
-        text_area.insert(tk.END, summary_str)
+        profiles = self.summary_profiles.setdefault(self.fingerprint, [])
+        if self.profile is not None and not profiles:
+            profiles.extend(self.profile.column_profile(col) for col in self.profile.columns)
+        self.write_summary(text_area)
+
+        view = (self.fingerprint, text_area, status_label)
+        self.summary_views.append(view)
+        self.show_summary_status(view)
+        self.start_summary_job()
+
+    def write_summary(self, text_area):
+        """Fill text_area with the overview and the column profiles computed so far."""
+        if self.profile is not None:
+            overview = f"{self.profile.rows:,} rows x {len(self.profile.columns)} columns (out-of-core, estimates marked ~)"
+        else:
+            overview = f"{len(self.df):,} rows x {len(self.df.columns)} columns, {self.df.memory_usage(deep=False).sum() / 1e6:,.1f} MB in memory (estimates marked ~)"
+        text_area.config(state=tk.NORMAL)
+        text_area.delete("1.0", tk.END)
+        text_area.insert(tk.END, f"DATASET OVERVIEW\n{'='*30}\n{overview}\n\nCOLUMN PROFILES\n{'='*30}\n")
+        for profile in self.summary_profiles[self.fingerprint]:
+            text_area.insert(tk.END, self.format_column_profile(profile))
         text_area.config(state=tk.DISABLED)
 
+    def start_summary_job(self):
+        """Profile the columns not yet in the summary cache, one at a time, on a worker thread."""
+        profiles = self.summary_profiles[self.fingerprint]
+        if self.summary_job is not None or self.df is None or len(profiles) == len(self.df.columns):
+            return
+        from stream_stats import profile_column
+        df, columns = self.df, self.df.columns[len(profiles):]
+
+        def profile_columns(job):
+            for col in columns:
+                if job.cancel_event.is_set():
+                    return None
+                job.report_progress(profile_column(df[col]))
+            return True
+
+        self.summary_job = BackgroundJob(profile_columns, None)
+        self.summary_job.start()
+        self.root.after(LOAD_POLL_MS, self.poll_summary_job, self.summary_job, self.fingerprint)
+
+    def poll_summary_job(self, job, fingerprint):
+        while True:
+            try:
+                kind, payload = job.messages.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self.summary_job:
+                continue  # cancelled by a reload or an append; its profiles are no longer wanted
+            if kind == "progress":
+                self.summary_profiles[fingerprint].append(payload[0])
+                for view in self.summary_views:
+                    if view[0] == fingerprint and view[1].winfo_exists():
+                        view[1].config(state=tk.NORMAL)
+                        view[1].insert(tk.END, self.format_column_profile(payload[0]))
+                        view[1].config(state=tk.DISABLED)
+            else:
+                self.summary_job = None
+                if kind == "error":
+                    messagebox.showerror("Summary Error", f"Failed to profile the data: {payload}")
+                break
+        self.summary_views = [view for view in self.summary_views if view[1].winfo_exists()]
+        for view in self.summary_views:
+            self.show_summary_status(view)
+        if job.is_alive() or not job.messages.empty():
+            self.root.after(LOAD_POLL_MS, self.poll_summary_job, job, fingerprint)
+
+    def show_summary_status(self, view):
+        fingerprint, _, status_label = view
+        if fingerprint != self.fingerprint:
+            status_label.config(text="A different file has been loaded since this summary was opened.")
+            return
+        done = len(self.summary_profiles[fingerprint])
+        total = len(self.profile.columns) if self.profile is not None else len(self.df.columns)
+        status_label.config(text=f"All {total} columns profiled." if done == total else f"Profiling column {done + 1} of {total}...")
+
+    def format_column_profile(self, profile):
+        def fmt(value):
+            if isinstance(value, Integral):
+                return f"{value:,}"
+            if isinstance(value, Real):
+                return f"{value:,.4g}"
+            return str(value)
+
+        total = profile.count + profile.nulls
+        approx = "~" if profile.approximate else ""
+        lines = [f"{profile.name}  [{profile.dtype}]",
+                 f"  non-null {profile.count:,} | nulls {profile.nulls:,} ({profile.nulls / max(total, 1):.1%}) | distinct {approx}{profile.distinct:,}"]
+        if profile.min is not None:
+            line = f"  min {fmt(profile.min)} | max {fmt(profile.max)}"
+            lines.append(line + (f" | mean {fmt(profile.mean)}" if profile.mean is not None else ""))
+        if profile.quantiles is not None:
+            approx_q = "~" if profile.approximate_quantiles else ""
+            lines.append("  " + " | ".join(f"{label} {approx_q}{fmt(q)}" for label, q in zip(("25%", "50%", "75%"), profile.quantiles)))
+        if profile.top:
+            lines.append("  top: " + ", ".join(f"{value} ({approx}{count:,})" for value, count in profile.top))
+        return "\n".join(lines) + "\n\n"
+
     def show_about_dialog(self):
         messagebox.showinfo(
             "About ODAT Data Visualizer",
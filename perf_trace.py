@@ -0,0 +1,195 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Opt-in timing and memory tracing of the app's hot paths, with an optional cProfile of each action.
+
+Instrumented code wraps a user action (load, plot, save) in
+``with tracer.action(name):`` and its phases in ``with tracer.span(name):``.
+Spans may nest. While the tracer is disabled both return one shared no-op
+context manager, so the instrumentation costs a method call.
+"""
+import contextlib
+import cProfile
+import csv
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from dataclasses import astuple, dataclass, field
+
+TRACE_HISTORY_ACTIONS = 200
+
+_NO_OP = contextlib.nullcontext()
+
+
+def current_rss_mb():
+    """Resident memory of this process, or None where /proc is unavailable (not Linux)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class Span:
+    name: str
+    depth: int
+    start: float
+    rss_before: float = None
+    duration: float = None
+    rss_after: float = None
+
+
+@dataclass
+class Action:
+    name: str
+    thread: str
+    spans: list = field(default_factory=list)
+    profile: cProfile.Profile = None
+    remote_stats: list = field(default_factory=list)  # cProfile stats of work done for it in other processes
+
+    @property
+    def duration(self):
+        return self.spans[0].duration
+
+
+class Tracer:
+    """Records the spans of the most recent actions; each thread has its own current action."""
+
+    def __init__(self, history=TRACE_HISTORY_ACTIONS):
+        self.enabled = False
+        self.profile_actions = False
+        self.actions = deque(maxlen=history)
+        self.epoch = time.perf_counter()
+        self._local = threading.local()
+
+    def action(self, name):
+        if not self.enabled:
+            return _NO_OP
+        if getattr(self._local, "action", None) is not None:
+            return self._span(name)  # an action started inside another one is just a phase of it
+        return self._action(name)
+
+    def span(self, name):
+        if not self.enabled or getattr(self._local, "action", None) is None:
+            return _NO_OP
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _action(self, name):
+        action = Action(name, threading.current_thread().name)
+        self._local.action, self._local.depth = action, 0
+        # cProfile only sees the thread it is enabled on, which is the one running the action.
+        profiler = cProfile.Profile() if self.profile_actions else None
+        try:
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:  # Python 3.12+ allows one active profiler per process
+                    profiler = None
+            with self._span(name):
+                yield action
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                action.profile = profiler
+            self._local.action = None
+            self.actions.append(action)
+
+    @contextlib.contextmanager
+    def _span(self, name):
+        action = self._local.action
+        span = Span(name, self._local.depth, time.perf_counter() - self.epoch, current_rss_mb())
+        action.spans.append(span)
+        self._local.depth += 1
+        try:
+            yield span
+        finally:
+            self._local.depth -= 1
+            span.duration = time.perf_counter() - self.epoch - span.start
+            span.rss_after = current_rss_mb()
+
+    def last_action(self, profiled=False):
+        for action in reversed(self.actions):
+            if not profiled or action.profile is not None or action.remote_stats:
+                return action
+        return None
+
+    def detach_last_action(self):
+        """Remove the last action and return its spans and cProfile stats in a picklable form, for attach() in another process."""
+        if not self.actions:
+            return None
+        action = self.actions.pop()
+        stats = None
+        if action.profile is not None:
+            action.profile.create_stats()
+            stats = action.profile.stats
+        return [astuple(span) for span in action.spans], stats
+
+    def attach(self, record):
+        """Nest the spans of a detached action under the current span, ending now; a no-op outside an action."""
+        action = getattr(self._local, "action", None)
+        if action is None or not record or not record[0]:
+            return
+        spans, stats = record
+        name, depth, start, rss_before, duration, rss_after = spans[0]
+        # The other process has its own clock, so the record is aligned to end now.
+        offset = time.perf_counter() - self.epoch - (start + duration)
+        for name, depth, start, rss_before, duration, rss_after in spans:
+            action.spans.append(Span(name, depth + self._local.depth, start + offset, rss_before, duration, rss_after))
+        if stats is not None:
+            action.remote_stats.append(stats)
+
+    def clear(self):
+        self.actions.clear()
+
+    def export(self, path):
+        """Write every recorded span to path: flat rows for .csv, otherwise Chrome trace-event JSON."""
+        actions = list(self.actions)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["action", "thread", "phase", "depth", "start_s", "duration_ms", "rss_before_mb", "rss_after_mb"])
+                for action in actions:
+                    for span in action.spans:
+                        writer.writerow([action.name, action.thread, span.name, span.depth, f"{span.start:.6f}",
+                                         f"{span.duration * 1000:.3f}", span.rss_before, span.rss_after])
+            return
+        # Loads in chrome://tracing and Perfetto.
+        events = [
+            {"name": span.name, "cat": action.name, "ph": "X", "pid": os.getpid(), "tid": action.thread,
+             "ts": round(span.start * 1e6), "dur": round(span.duration * 1e6),
+             "args": {"rss_before_mb": span.rss_before, "rss_after_mb": span.rss_after}}
+            for action in actions for span in action.spans
+        ]
+        with open(path, "w") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+
+    def save_profile(self, path):
+        """Dump the cProfile of the last profiled action, merged with that of its work in other processes, for pstats/snakeviz; False if there is none."""
+        action = self.last_action(profiled=True)
+        if action is None:
+            return False
+        parts = ([action.profile] if action.profile is not None else []) + [_RecordedStats(stats) for stats in action.remote_stats]
+        merged = pstats.Stats(parts[0])
+        if len(parts) > 1:
+            merged.add(*parts[1:])
+        merged.dump_stats(path)
+        return True
+
+
+class _RecordedStats:
+    """cProfile stats received from another process, in the form pstats.Stats loads."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+tracer = Tracer()
@@ -0,0 +1,1159 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""GUI-free plotting engine shared by the Tk app and the batch renderer."""
+import io
+import math
+import os
+import pickle
+import sys
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, dataclass
+
+import pandas as pd
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.colors import LogNorm, to_rgb
+from matplotlib.patches import Patch
+import seaborn as sns
+
+from perf_trace import tracer
+from plot_types import PLOT_TYPES, ONE_COLUMN_PLOTS, TWO_COLUMN_PLOTS, STREAM_PLOTS
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # the columnar cache is optional
+    pa = None
+    feather = None
+
+PAIR_PAGE_SIZE = 6
+PAIR_PANEL_INCHES = 2.0
+PAIR_DIAGONAL_BINS = 30
+PAIR_DENSITY_BINS = 80
+PAIR_SCATTER_MAX_ROWS = 20_000
+
+LOAD_CHUNK_ROWS = 100_000
+CACHE_SUFFIX = ".odat-cache.feather"
+# DataFrame.attrs key under which load_csv records how many bytes of the file the frame holds.
+SOURCE_OFFSET_ATTR = "odat_source_offset"
+CATEGORY_MAX_UNIQUE = 1000
+CATEGORY_MAX_RATIO = 0.5
+DATE_SAMPLE_SIZE = 1000
+DATE_PATTERN = r"^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+# Whole-number floats are stored as integers only up to this magnitude, where float64 is still exact.
+INT_EXACT_MAX = 2**53
+AGGREGATE_ROW_THRESHOLD = 200_000
+DENSITY_MAX_HUE_LEVELS = 10
+PLOT_CACHE_BUDGET_BYTES = 256 * 2**20
+KDE_GRID_POINTS = 512
+VIOLIN_KDE_CUT = 2
+# Rough size of a data layer in a vector export: per point when drawn as paths, per pixel of its
+# axes when embedded as an image. EPS/PS embed images uncompressed, so they are never rasterized.
+VECTOR_BYTES_PER_POINT = {"pdf": 15, "svg": 110, "svgz": 110}
+RASTER_BYTES_PER_PIXEL = 1.0
+
+
+def cache_path_for(filepath):
+    """Location of the columnar copy kept next to a CSV file."""
+    directory, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{name}{CACHE_SUFFIX}")
+
+
+def source_signature(filepath):
+    st = os.stat(filepath)
+    return {
+        b"odat_source_path": os.path.abspath(filepath).encode(),
+        b"odat_source_size": str(st.st_size).encode(),
+        b"odat_source_mtime_ns": str(st.st_mtime_ns).encode(),
+    }
+
+
+def read_cached_frame(filepath):
+    """Return the memory-mapped cached copy of filepath, or None if it is missing or stale."""
+    if feather is None:
+        return None
+    path = cache_path_for(filepath)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowException):
+        return None
+    metadata = table.schema.metadata or {}
+    if any(metadata.get(key) != value for key, value in source_signature(filepath).items()):
+        return None
+    return table.to_pandas()
+
+
+class ByteRange(io.RawIOBase):
+    """Read-only view of length bytes of an open binary file from its current position."""
+
+    def __init__(self, handle, length):
+        self.handle = handle
+        self.length = length
+        self.remaining = length
+
+    @property
+    def consumed(self):
+        return self.length - self.remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:self.remaining]
+        n = self.handle.readinto(view)
+        self.remaining -= n
+        return n
+
+
+def write_cached_frame(df, signature, filepath):
+    """Store df as an uncompressed Feather file so later opens can memory-map it."""
+    if feather is None:
+        return
+    path = cache_path_for(filepath)
+    tmp_path = path + ".tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **signature})
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException):
+        # Read-only directories and mixed-type columns just go without a cache.
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def downcast_numeric(series):
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy()
+        if (series.isna().any() or not np.isfinite(values).all() or (np.abs(values) > INT_EXACT_MAX).any()
+                or not np.array_equal(values, np.round(values))):
+            return series
+        series = series.astype(np.int64)
+    return pd.to_numeric(series, downcast='integer')
+
+
+def narrow_text(series):
+    non_null = series.dropna()
+    if non_null.empty:
+        return series
+    sample = non_null.iloc[:DATE_SAMPLE_SIZE].astype(str)
+    if sample.str.match(DATE_PATTERN).all():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(series, dayfirst=True, errors='coerce')
+        if parsed.notna().sum() == len(non_null):
+            return parsed
+    n_unique = non_null.nunique()
+    if n_unique <= CATEGORY_MAX_UNIQUE and n_unique <= CATEGORY_MAX_RATIO * len(series):
+        return series.astype('category')
+    return series
+
+
+def optimize_dtypes(df):
+    """Narrow parser-default dtypes: 0/1 flags and whole numbers to small ints,
+    repetitive strings to category and date strings to datetime64."""
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_numeric_dtype(series):
+            df[col] = downcast_numeric(series)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            df[col] = narrow_text(series)
+    return df
+
+
+def axes_pixel_size(ax):
+    """Width and height of ax in device pixels."""
+    fig = ax.figure
+    position = ax.get_position()
+    fig_width, fig_height = fig.get_size_inches() * fig.dpi
+    return max(int(position.width * fig_width), 1), max(int(position.height * fig_height), 1)
+
+
+def data_extent(values):
+    lo, hi = float(np.min(values)), float(np.max(values))
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return lo, hi
+
+
+def bin_indices(values, lo, hi, n_bins):
+    scaled = (values - lo) * (n_bins / (hi - lo))
+    return np.clip(scaled.astype(np.int64), 0, n_bins - 1)
+
+
+def hue_codes(hue):
+    """Map a hue column to integer layer codes, keeping the most frequent levels and lumping the rest."""
+    counts = hue.value_counts()
+    levels = [str(level) for level in counts.index[:DENSITY_MAX_HUE_LEVELS]]
+    labels = hue.astype(str).where(hue.notna())
+    if len(counts) > DENSITY_MAX_HUE_LEVELS:
+        labels = labels.where(labels.isin(levels) | labels.isna(), "Other")
+        levels.append("Other")
+    codes = pd.Categorical(labels, categories=levels).codes
+    return codes, levels
+
+
+def density_counts(x, y, extent, shape, codes=None, n_layers=1, weights=None):
+    """Count points per pixel in a single bincount pass.
+
+    Returns an array of shape (n_layers, height, width); with weights the
+    per-pixel sums of weights are returned instead of counts.
+    """
+    width, height = shape
+    ix = bin_indices(x, extent[0], extent[1], width)
+    iy = bin_indices(y, extent[2], extent[3], height)
+    flat = iy * width + ix
+    if codes is not None:
+        flat = flat + codes.astype(np.int64) * (width * height)
+    counts = np.bincount(flat, weights=weights, minlength=n_layers * width * height)
+    return counts.reshape(n_layers, height, width)
+
+
+def composite_layers(counts, colors):
+    """Blend per-category count layers into an RGBA image.
+
+    Colour is the count-weighted mix of the category colours; opacity
+    follows the log of the total count so sparse regions stay visible.
+    """
+    total = counts.sum(axis=0)
+    rgb = np.tensordot(counts, np.asarray(colors), axes=(0, 0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rgb /= total[..., None]
+    alpha = np.log1p(total) / np.log1p(max(total.max(), 1))
+    image = np.dstack([np.nan_to_num(rgb), alpha])
+    return image
+
+
+def draw_raster(ax, data, extent, log_scale, **kwargs):
+    """Show a pixel-grid array over extent (given in binning space).
+
+    imshow assumes pixels evenly spaced in data coordinates, which log-binned
+    data is not, so log axes get an equivalent pcolormesh with log-spaced edges.
+    """
+    if not log_scale:
+        return ax.imshow(data, extent=extent, origin='lower', aspect='auto', interpolation='nearest', **kwargs)
+    height, width = data.shape[:2]
+    x_edges = np.logspace(extent[0], extent[1], width + 1)
+    y_edges = np.logspace(extent[2], extent[3], height + 1)
+    return ax.pcolormesh(x_edges, y_edges, data, shading='flat', **kwargs)
+
+
+class SortedColumnIndex:
+    """Row order of a numeric column, so rows in a value range are found by binary search."""
+
+    def __init__(self, values):
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def extend(self, values):
+        """Merge in rows appended to the column, holding values, without re-sorting the rows already indexed."""
+        order = np.argsort(values, kind='stable')
+        new_values = values[order]
+        positions = np.searchsorted(self.sorted_values, new_values, side='right')
+        self.order = np.insert(self.order, positions, order + len(self.order))
+        self.sorted_values = np.insert(self.sorted_values, positions, new_values)
+
+    def rows_between(self, lo, hi, pad=0):
+        start = max(np.searchsorted(self.sorted_values, lo, side='left') - pad, 0)
+        stop = min(np.searchsorted(self.sorted_values, hi, side='right') + pad, len(self.order))
+        return self.order[start:stop]
+
+
+def sorted_index(index_cache, name, values):
+    """The cached index of column name, built on first use; rows appended to values since are merged in."""
+    index = index_cache.get(name)
+    if index is None:
+        index = index_cache[name] = SortedColumnIndex(values)
+    elif len(index) < len(values):
+        index.extend(values[len(index):])
+    return index
+
+
+class DensityView:
+    """Scatter plot drawn as a per-pixel density raster instead of one marker per row.
+
+    compute() can be run off the Tk thread to re-bin only the rows inside new
+    axis limits; apply() then swaps the result into the existing artist.
+    """
+
+    def __init__(self, x, y, hue=None, log_scale=False, index_cache=None):
+        self.x = x
+        self.y = y
+        self.hue = hue
+        self.x_values = np.asarray(x, dtype=float)
+        self.y_values = np.asarray(y, dtype=float)
+        self.log_scale = log_scale
+        self.index_cache = {} if index_cache is None else index_cache
+        self.ax = None
+        self.artist = None
+        self.colorbar = None
+        self.artist_kwargs = {}
+        if hue is None:
+            self.mode = 'count'
+        elif pd.api.types.is_numeric_dtype(hue) and hue.nunique() > DENSITY_MAX_HUE_LEVELS:
+            self.mode = 'mean'
+            self.hue_values = np.asarray(hue, dtype=float)
+        else:
+            self.mode = 'layers'
+            self.codes, self.levels = hue_codes(hue)
+            self.colors = [to_rgb(c) for c in sns.color_palette(n_colors=min(len(self.levels), DENSITY_MAX_HUE_LEVELS))]
+            if len(self.levels) > DENSITY_MAX_HUE_LEVELS:
+                self.colors.append(to_rgb('grey'))
+
+    def to_bin_space(self, values):
+        return np.log10(values) if self.log_scale else values
+
+    def points(self, rows=None, extent=None):
+        """Binning-space coordinates of the plottable rows (optionally a subset clipped to extent)."""
+        x = self.x_values if rows is None else self.x_values[rows]
+        y = self.y_values if rows is None else self.y_values[rows]
+        mask = np.isfinite(x) & np.isfinite(y)
+        if self.mode == 'mean':
+            mask &= np.isfinite(self.hue_values if rows is None else self.hue_values[rows])
+        elif self.mode == 'layers':
+            mask &= (self.codes if rows is None else self.codes[rows]) >= 0
+        if self.log_scale:
+            mask &= (x > 0) & (y > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xs, ys = self.to_bin_space(x), self.to_bin_space(y)
+        if extent is not None:
+            mask &= (xs >= extent[0]) & (xs <= extent[1]) & (ys >= extent[2]) & (ys <= extent[3])
+        selected = np.flatnonzero(mask)
+        if rows is not None:
+            selected = rows[selected]
+        return xs[mask], ys[mask], selected
+
+    def raster(self, xs, ys, selected, extent, shape):
+        if self.mode == 'count':
+            counts = density_counts(xs, ys, extent, shape)[0]
+            return np.ma.masked_equal(counts, 0)
+        if self.mode == 'mean':
+            counts = density_counts(xs, ys, extent, shape)[0]
+            sums = density_counts(xs, ys, extent, shape, weights=self.hue_values[selected])[0]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.ma.masked_invalid(sums / counts)
+        counts = density_counts(xs, ys, extent, shape, self.codes[selected], len(self.levels))
+        return composite_layers(counts, self.colors)
+
+    def draw(self, ax):
+        self.ax = ax
+        xs, ys, selected = self.points()
+        if len(xs) == 0:
+            raise ValueError("No finite values to plot.")
+        extent = data_extent(xs) + data_extent(ys)
+        data = self.raster(xs, ys, selected, extent, axes_pixel_size(ax))
+        if self.mode == 'count':
+            self.artist_kwargs = dict(cmap='viridis', norm=LogNorm(vmin=1, vmax=max(data.max(), 1)))
+        elif self.mode == 'mean':
+            self.artist_kwargs = dict(cmap='viridis')
+        self.artist = draw_raster(ax, data, extent, self.log_scale, **self.artist_kwargs)
+        if self.mode == 'count':
+            self.colorbar = ax.figure.colorbar(self.artist, ax=ax, label='Count')
+        elif self.mode == 'mean':
+            self.colorbar = ax.figure.colorbar(self.artist, ax=ax, label=f'Mean {self.hue.name}')
+        else:
+            ax.legend(handles=[Patch(color=c, label=l) for c, l in zip(self.colors, self.levels)], title=self.hue.name, loc='upper right')
+        if self.log_scale:
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+        ax.set_xlabel(self.x.name)
+        ax.set_ylabel(self.y.name)
+
+    def compute(self, xlim, ylim, shape):
+        """Re-bin the rows visible within xlim/ylim at shape pixels."""
+        extent = tuple(self.to_bin_space(np.array(sorted(xlim)))) + tuple(self.to_bin_space(np.array(sorted(ylim))))
+        index = sorted_index(self.index_cache, self.x.name, self.x_values)
+        rows = index.rows_between(min(xlim), max(xlim))
+        xs, ys, selected = self.points(rows, extent)
+        return extent, self.raster(xs, ys, selected, extent, shape)
+
+    def apply(self, result):
+        extent, data = result
+        if self.mode == 'count':
+            self.artist.norm.vmax = max(data.max() if data.count() else 1, 1)
+        if self.log_scale:
+            # A QuadMesh cannot be moved, so replace it and keep the colorbar attached.
+            self.artist.remove()
+            self.artist = draw_raster(self.ax, data, extent, True, **self.artist_kwargs)
+            if self.colorbar is not None:
+                self.colorbar.update_normal(self.artist)
+        else:
+            self.artist.set_data(data)
+            self.artist.set_extent(extent)
+            if self.mode == 'mean':
+                self.artist.autoscale()
+
+
+def m4_indices(x, y, n_buckets):
+    """Row positions of the first, last, min and max point of every x-bucket (M4 decimation),
+    ordered by x. Drawing only these rows preserves the line's per-pixel envelope."""
+    positions = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(positions) == 0:
+        return positions
+    xs, ys = x[positions], y[positions]
+    lo, hi = data_extent(xs)
+    frame = pd.DataFrame({'bucket': bin_indices(xs, lo, hi, n_buckets), 'x': xs, 'y': ys})
+    grouped = frame.groupby('bucket', sort=False)
+    keep = np.unique(np.concatenate([
+        grouped['x'].idxmin(), grouped['x'].idxmax(),
+        grouped['y'].idxmin(), grouped['y'].idxmax(),
+    ]))
+    keep = keep[np.argsort(xs[keep], kind='stable')]
+    return positions[keep]
+
+
+class LineView:
+    """Line plot drawn from its M4-decimated rows, one bucket per horizontal pixel."""
+
+    def __init__(self, x, y, index_cache=None):
+        self.x = x
+        self.y = y
+        self.x_values = np.asarray(x, dtype=float)
+        self.y_values = np.asarray(y, dtype=float)
+        self.index_cache = {} if index_cache is None else index_cache
+        self.ax = None
+        self.artist = None
+
+    def draw(self, ax):
+        self.ax = ax
+        keep = m4_indices(self.x_values, self.y_values, axes_pixel_size(ax)[0])
+        self.artist, = ax.plot(self.x_values[keep], self.y_values[keep], linewidth=1)
+        ax.set_xlabel(self.x.name)
+        ax.set_ylabel(self.y.name)
+
+    def compute(self, xlim, ylim, shape):
+        index = sorted_index(self.index_cache, self.x.name, self.x_values)
+        # One extra row on each side keeps the line running to the plot edges.
+        rows = index.rows_between(min(xlim), max(xlim), pad=1)
+        keep = rows[m4_indices(self.x_values[rows], self.y_values[rows], shape[0])]
+        return self.x_values[keep], self.y_values[keep]
+
+    def apply(self, result):
+        self.artist.set_data(*result)
+
+
+class PlotError(Exception):
+    """A plot request that cannot be drawn from the given data (wrong column types, too few columns...)."""
+
+
+@dataclass
+class PlotSpec:
+    plot_type: str
+    col1: str = None
+    col2: str = None
+    col3: str = None
+    bins: int = 30
+    log_scale: bool = False
+    page: int = 0
+
+
+def dataset_fingerprint(filepath, rows):
+    """Identity of a loaded dataset: its source file's path, size and mtime, plus the row count."""
+    return tuple(value.decode() for value in source_signature(filepath).values()) + (rows,)
+
+
+def plot_key(fingerprint, spec):
+    return (fingerprint,) + astuple(spec)
+
+
+def value_nbytes(value):
+    """Rough in-memory size of a cached aggregate."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(value_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def figure_nbytes(fig):
+    """Rough in-memory size of a rendered figure: its pixel buffers plus the data arrays of its artists."""
+    # One RGBA buffer for Agg and one for the Tk photo image it is blitted into.
+    nbytes = int(fig.bbox.width * fig.bbox.height) * 4 * 2
+    for artist in fig.findobj():
+        for getter in ('get_array', 'get_offsets', 'get_xydata', 'get_coordinates'):
+            data = getattr(artist, getter, None)
+            if data is not None:
+                data = data()
+                nbytes += data.nbytes if isinstance(data, np.ndarray) else 0
+    return nbytes
+
+
+class PlotCache:
+    """Least-recently-used store of rendered plots and plot aggregates, bounded by an estimated byte budget.
+
+    Each entry may carry a release(value) callback, called when the entry is
+    evicted or the cache is cleared. The most recently stored entry is always
+    kept, even when it alone exceeds the budget.
+    """
+
+    def __init__(self, budget_bytes=PLOT_CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, value, nbytes, release=None):
+        if key in self.entries:
+            self._drop(key, release_value=self.entries[key][0] is not value)
+        self.entries[key] = (value, nbytes, release)
+        self.nbytes += nbytes
+        while self.nbytes > self.budget_bytes and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+
+    def memoize(self, key, compute):
+        """Cached value for key, calling compute() to build and store it on a miss."""
+        if key in self.entries:
+            return self.get(key)
+        value = compute()
+        self.put(key, value, value_nbytes(value))
+        return value
+
+    def clear(self):
+        while self.entries:
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key, release_value=True):
+        value, nbytes, release = self.entries.pop(key)
+        self.nbytes -= nbytes
+        if release is not None and release_value:
+            release(value)
+
+
+def no_memo(key, compute):
+    return compute()
+
+
+class PairGrid:
+    """Corner pair plot of any number of numeric columns, drawn one page at a time.
+
+    The lower triangle is split into square tiles of up to PAIR_PAGE_SIZE
+    columns per side, and each tile is one page. Diagonal histograms are
+    computed once per column and kept across pages. Off-diagonal panels
+    are binned into a density raster above PAIR_SCATTER_MAX_ROWS rows. All
+    panels of a page are computed in parallel before anything is drawn.
+    """
+
+    def __init__(self, df, columns, page_size=PAIR_PAGE_SIZE):
+        if len(columns) < 2:
+            raise PlotError("Need at least two numeric columns for pair plot.")
+        self.df = df
+        self.columns = list(columns)
+        self.page_size = page_size
+        n_blocks = math.ceil(len(self.columns) / page_size)
+        self.pages = [(row, col) for row in range(n_blocks) for col in range(row + 1)]
+        self.ranges = {}
+        self.diagonals = {}
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def block(self, index):
+        return self.columns[index * self.page_size:(index + 1) * self.page_size]
+
+    def values(self, col):
+        return self.df[col].to_numpy(dtype=float, na_value=np.nan)
+
+    def column_range(self, col):
+        if col not in self.ranges:
+            values = self.values(col)
+            finite = values[np.isfinite(values)]
+            self.ranges[col] = data_extent(finite) if len(finite) else (0.0, 1.0)
+        return self.ranges[col]
+
+    def diagonal(self, col):
+        if col not in self.diagonals:
+            values = self.values(col)
+            self.diagonals[col] = np.histogram(values[np.isfinite(values)], bins=PAIR_DIAGONAL_BINS, range=self.column_range(col))
+        return self.diagonals[col]
+
+    def off_diagonal(self, x_col, y_col):
+        x, y = self.values(x_col), self.values(y_col)
+        mask = np.isfinite(x) & np.isfinite(y)
+        x, y = x[mask], y[mask]
+        if len(x) <= PAIR_SCATTER_MAX_ROWS:
+            return 'scatter', (x, y)
+        extent = self.column_range(x_col) + self.column_range(y_col)
+        return 'density', (density_counts(x, y, extent, (PAIR_DENSITY_BINS, PAIR_DENSITY_BINS))[0], extent)
+
+    def panel(self, x_col, y_col):
+        if x_col == y_col:
+            return 'diagonal', self.diagonal(x_col)
+        return self.off_diagonal(x_col, y_col)
+
+    def render(self, page=0):
+        row_block, col_block = self.pages[page]
+        row_cols, col_cols = self.block(row_block), self.block(col_block)
+        cells = [(r, c) for r in range(len(row_cols)) for c in range(len(col_cols))
+                 if row_block != col_block or c <= r]
+        with ThreadPoolExecutor() as pool:
+            panels = list(pool.map(lambda cell: self.panel(col_cols[cell[1]], row_cols[cell[0]]), cells))
+
+        fig = Figure(figsize=(PAIR_PANEL_INCHES * len(col_cols), PAIR_PANEL_INCHES * len(row_cols)), dpi=100)
+        axes = fig.subplots(len(row_cols), len(col_cols), squeeze=False)
+        drawn = set(cells)
+        for (r, c), (kind, data) in zip(cells, panels):
+            ax = axes[r][c]
+            if kind == 'diagonal':
+                counts, edges = data
+                ax.stairs(counts, edges, fill=True, alpha=0.7)
+            elif kind == 'scatter':
+                ax.scatter(*data, s=5, alpha=0.6, linewidths=0)
+            else:
+                counts, extent = data
+                ax.imshow(np.ma.masked_equal(counts, 0), extent=extent, origin='lower', aspect='auto',
+                          interpolation='nearest', cmap='Blues', norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)))
+            ax.set_xlabel(col_cols[c] if r == len(row_cols) - 1 else '')
+            ax.set_ylabel(row_cols[r] if c == 0 else '')
+            ax.tick_params(labelsize=7)
+        for r in range(len(row_cols)):
+            for c in range(len(col_cols)):
+                if (r, c) not in drawn:
+                    axes[r][c].set_visible(False)
+
+        title = 'Pair Plot of Numerical Variables'
+        if self.page_count > 1:
+            title += f' (page {page + 1} of {self.page_count})'
+        fig.suptitle(title)
+        fig.tight_layout()
+        return fig
+
+
+def load_csv(filepath, chunk_rows=LOAD_CHUNK_ROWS, on_progress=None, on_stage=None, is_cancelled=None):
+    """Load filepath from its columnar cache when fresh, otherwise parse it in chunks.
+
+    on_progress(bytes_read, total_bytes, rows) is called after every chunk and
+    on_stage(text) before the post-processing steps. Returns None if
+    is_cancelled() turns true part-way. Only the bytes present when loading
+    starts are read; their count is left in df.attrs[SOURCE_OFFSET_ATTR], so
+    rows appended meanwhile can be picked up later (see follow.py).
+    """
+    total_bytes = os.path.getsize(filepath)
+    with tracer.span("read columnar cache"):
+        cached = read_cached_frame(filepath)
+    if cached is not None:
+        if on_progress:
+            on_progress(total_bytes, total_bytes, len(cached))
+        # A cache only counts as fresh while the file still has the size it was written for.
+        cached.attrs[SOURCE_OFFSET_ATTR] = total_bytes
+        return cached
+    signature = source_signature(filepath)
+    total_bytes = int(signature[b"odat_source_size"])
+    chunks = []
+    rows = 0
+    with tracer.span("parse"), open(filepath, 'rb') as handle:
+        reader = io.BufferedReader(ByteRange(handle, total_bytes))
+        for chunk in pd.read_csv(reader, chunksize=chunk_rows):
+            if is_cancelled and is_cancelled():
+                return None
+            chunks.append(chunk)
+            rows += len(chunk)
+            if on_progress:
+                on_progress(reader.raw.consumed, total_bytes, rows)
+    if is_cancelled and is_cancelled():
+        return None
+    with tracer.span("concatenate chunks"):
+        # A header-only file yields no chunks; let read_csv build the empty frame.
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.read_csv(filepath, nrows=0)
+    if on_stage:
+        on_stage("Optimizing column types...")
+    with tracer.span("optimize dtypes"):
+        df = optimize_dtypes(df)
+    if on_stage:
+        on_stage("Writing columnar cache...")
+    with tracer.span("write columnar cache"):
+        write_cached_frame(df, signature, filepath)
+    df.attrs[SOURCE_OFFSET_ATTR] = total_bytes
+    return df
+
+
+def numeric_columns(df):
+    return df.select_dtypes(include=np.number).columns.tolist()
+
+
+def require_numeric(df, columns, message):
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in columns):
+        raise PlotError(message)
+
+
+def linear_binning(values, lo, hi, n_points=KDE_GRID_POINTS):
+    """Weights of values on n_points grid points from lo to hi, each value split between its two nearest points."""
+    step = (hi - lo) / (n_points - 1)
+    position = (values - lo) / step
+    left = np.clip(position.astype(np.intp), 0, n_points - 2)
+    right_weight = position - left
+    return np.bincount(left, 1 - right_weight, minlength=n_points) + np.bincount(left + 1, right_weight, minlength=n_points)
+
+
+def smoothed_kde(weights, n, std, lo, hi):
+    """Gaussian KDE (Scott's bandwidth) of n values with standard deviation std, from their linear_binning weights.
+
+    The weights are convolved with the kernel by FFT. Returns (grid, density),
+    or None when the values have no spread.
+    """
+    bandwidth = std * n ** -0.2 if n > 1 else 0.0
+    if not bandwidth > 0 or not hi > lo:
+        return None
+    n_points = len(weights)
+    grid = np.linspace(lo, hi, n_points)
+    step = (hi - lo) / (n_points - 1)
+    half_width = min(int(np.ceil(4 * bandwidth / step)), n_points - 1)
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    # Zero-pad past the kernel's reach so the circular convolution does not wrap around.
+    size = 1 << int(np.ceil(np.log2(n_points + 2 * half_width + 1)))
+    smoothed = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)
+    density = smoothed[half_width:half_width + n_points] / n
+    return grid, np.maximum(density, 0)
+
+
+def binned_kde(values, lo, hi, n_points=KDE_GRID_POINTS):
+    """Gaussian KDE (Scott's bandwidth) of values on n_points from lo to hi.
+
+    The values are linearly binned onto the grid and the bin weights are
+    convolved with the kernel by FFT, so the cost is O(n + n_points log
+    n_points) rather than O(n * n_points). Returns (grid, density), or None
+    when values have no spread.
+    """
+    if not hi > lo:
+        return None
+    return smoothed_kde(linear_binning(values, lo, hi, n_points), len(values), values.std(), lo, hi)
+
+
+class HistogramState:
+    """Histogram and KDE of a column that can take in more values without a rescan.
+
+    The bin edges and KDE grid span the first values' range. add() keeps the
+    result exactly equal to a rescan as long as new values fall within that
+    range, and returns False, leaving the state unchanged, when they do not.
+    """
+
+    def __init__(self, values, bins, log_scale=False):
+        self.log_scale = log_scale
+        values = self.prepare(values)
+        if len(values) == 0:
+            raise PlotError("No values to plot.")
+        self.counts, self.edges = np.histogram(values, bins=bins)
+        self.lo, self.hi = values.min(), values.max()
+        self.n, self.mean = len(values), values.mean()
+        self.m2 = np.sum((values - self.mean) ** 2)
+        self.weights = linear_binning(values, self.lo, self.hi) if self.hi > self.lo else None
+
+    def prepare(self, values):
+        values = values[np.isfinite(values)]
+        return np.log10(values[values > 0]) if self.log_scale else values
+
+    def add(self, values):
+        values = self.prepare(values)
+        if len(values) == 0:
+            return True
+        if values.min() < self.lo or values.max() > self.hi:
+            return False
+        self.counts = self.counts + np.histogram(values, bins=self.edges)[0]
+        # Chan et al.'s pairwise update of the mean and sum of squared deviations.
+        n, mean = len(values), values.mean()
+        delta, total = mean - self.mean, self.n + n
+        self.m2 += np.sum((values - mean) ** 2) + delta ** 2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+        if self.weights is not None:
+            self.weights = self.weights + linear_binning(values, self.lo, self.hi)
+        return True
+
+    def summary(self):
+        """Counts, edges and a KDE curve in count units, as histogram_summary returns them."""
+        kde = None if self.weights is None else smoothed_kde(self.weights, self.n, np.sqrt(self.m2 / self.n), self.lo, self.hi)
+        if kde is not None:
+            grid, density = kde
+            kde = (10 ** grid if self.log_scale else grid, density * self.n * (self.edges[1] - self.edges[0]))
+        return self.counts, 10 ** self.edges if self.log_scale else self.edges, kde
+
+
+def histogram_summary(values, bins, log_scale=False):
+    """Counts, edges and a KDE curve in count units, binned in log10 space when log_scale."""
+    return HistogramState(values, bins, log_scale).summary()
+
+
+def sorted_quantile(values, q):
+    """Linearly interpolated quantile of already sorted values, as numpy.quantile computes it."""
+    position = q * (len(values) - 1)
+    below = int(position)
+    above = min(below + 1, len(values) - 1)
+    return values[below] + (values[above] - values[below]) * (position - below)
+
+
+def box_summary(values, kde_cut=VIOLIN_KDE_CUT):
+    """Quartiles, 1.5 IQR whiskers, outliers and a KDE of one group's values."""
+    values = np.sort(values)
+    q1, med, q3 = (sorted_quantile(values, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside_lo = np.searchsorted(values, q1 - 1.5 * iqr, side='left')
+    inside_hi = np.searchsorted(values, q3 + 1.5 * iqr, side='right')
+    bandwidth = values.std() * len(values) ** -0.2
+    kde = binned_kde(values, values[0] - kde_cut * bandwidth, values[-1] + kde_cut * bandwidth)
+    return dict(med=med, q1=q1, q3=q3, whislo=values[inside_lo], whishi=values[inside_hi - 1],
+                fliers=np.concatenate([values[:inside_lo], values[inside_hi:]]), kde=kde)
+
+
+def group_summaries(x, y, hue=None, kde_cut=VIOLIN_KDE_CUT):
+    """Box statistics and a KDE of y for every (x, hue) group, in one grouped pass.
+
+    Rows are ordered by group with a single stable sort of the group codes,
+    after which each group is a contiguous slice, summarised on a thread pool.
+    Returns matplotlib bxp() dicts keyed by (x, hue) with an extra "kde" entry
+    of (grid, density).
+    """
+    x_codes, x_levels = pd.factorize(x, sort=True)
+    if hue is None:
+        hue_group_codes, hue_levels = np.zeros(len(y), dtype=np.intp), ['']
+    else:
+        hue_group_codes, hue_levels = pd.factorize(hue, sort=True)
+    # Narrow float columns stay narrow; the per-group sorts move half the bytes.
+    values = y.to_numpy(dtype=y.dtype if y.dtype.kind == 'f' else np.float64, na_value=np.nan)
+    n_groups = len(x_levels) * len(hue_levels)
+    code_type = np.min_scalar_type(n_groups)
+    valid = (x_codes >= 0) & (hue_group_codes >= 0) & ~np.isnan(values)
+    codes = (x_codes.astype(code_type) * code_type.type(len(hue_levels)) + hue_group_codes.astype(code_type))[valid]
+    # numpy radix-sorts 8/16-bit integers, far faster than its merge sort for wider ones.
+    values = values[valid][np.argsort(codes, kind='stable')]
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_groups))])
+
+    present = [code for code in range(n_groups) if bounds[code + 1] > bounds[code]]
+    if not present:
+        raise PlotError("No values to plot.")
+    with ThreadPoolExecutor() as pool:
+        summaries = pool.map(lambda code: box_summary(values[bounds[code]:bounds[code + 1]], kde_cut), present)
+        stats = {}
+        for code, summary in zip(present, summaries):
+            x_level = x_levels[code // len(hue_levels)]
+            stats[(x_level, hue_levels[code % len(hue_levels)])] = dict(summary, label=str(x_level))
+    return stats
+
+
+def render_plot(df, spec, index_cache=None, memo=no_memo):
+    """Draw spec from df on a new Figure.
+
+    Returns (figure, view); view is the DensityView/LineView of an aggregated
+    plot, which can be re-aggregated on zoom, and None otherwise. memo(key,
+    compute) may return a stored aggregate (value counts, correlation matrix)
+    instead of recomputing it, e.g. PlotCache.memoize.
+    """
+    plot_choice = spec.plot_type
+    col1, col2, col3 = spec.col1, spec.col2, spec.col3
+
+    def stat(key, compute):
+        with tracer.span("stats"):
+            return memo(key, compute)
+
+    if plot_choice not in PLOT_TYPES:
+        raise PlotError(f"Unknown plot type: {plot_choice}")
+    if plot_choice in ONE_COLUMN_PLOTS and col1 is None or plot_choice in TWO_COLUMN_PLOTS and col2 is None:
+        raise PlotError(f"{plot_choice} requires more column selections.")
+    for col in (col1, col2, col3):
+        if col is not None and col not in df.columns:
+            raise PlotError(f"Column not found: {col}")
+
+    if plot_choice == "Pair Plot":
+        with tracer.span("pair grid"):
+            return PairGrid(df, numeric_columns(df)).render(spec.page), None
+
+    with tracer.span("data prep"):
+        fig = Figure(figsize=(8, 6), dpi=100)
+        ax = fig.add_subplot(111)
+    view = None
+    log_scale = spec.log_scale
+
+    # "stats" and "data prep" spans nest inside "artists" wherever they can be told apart from drawing.
+    with tracer.span("artists"):
+        if plot_choice == "Histogram":
+            require_numeric(df, [col1], "Please select a numeric column for Histogram.")
+            values = df[col1].to_numpy(dtype=np.float64, na_value=np.nan)
+            counts, edges, kde = stat(("histogram", col1, spec.bins, log_scale), lambda: histogram_summary(values, spec.bins, log_scale))
+            color = to_rgb('C0')
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', facecolor=(*color, 0.5), edgecolor='black', linewidth=1)
+            if kde is not None:
+                ax.plot(*kde, color=color, linewidth=1.5)
+            if log_scale:
+                ax.set_xscale('log')
+            ax.set_xlabel(col1)
+            ax.set_ylabel('Count')
+            ax.set_title(f'Histogram of {col1}')
+
+        elif plot_choice == "Bar Chart (Counts)":
+            counts = stat(("value_counts", col1), lambda: df[col1].value_counts())
+            ax.bar([str(v) for v in counts.index], counts.values, color=sns.color_palette('viridis', len(counts)))
+            ax.set_xlabel(col1)
+            ax.set_ylabel('count')
+            ax.set_title(f'Distribution of {col1}')
+            ax.tick_params(axis='x', rotation=45)
+
+        elif plot_choice == "Pie Chart":
+            counts = stat(("value_counts", col1), lambda: df[col1].value_counts())
+            ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette('pastel'))
+            ax.set_title(f'Proportion of {col1}')
+            ax.axis('equal')
+
+        elif plot_choice in ["Box Plot", "Violin Plot"]:
+            require_numeric(df, [col2], "Y-Axis must be numeric for this plot.")
+            stats = stat(("groups", col1, col2, col3), lambda: group_summaries(df[col1], df[col2], df[col3] if col3 else None))
+            if plot_choice == "Box Plot":
+                draw_group_boxes(ax, stats, col3, show_fliers=True)
+            else:
+                draw_group_violins(ax, stats, col3)
+            ax.set_xlabel(col1)
+            ax.set_ylabel(col2)
+            ax.set_title(f'{plot_choice}: {col2} by {col1}')
+            ax.tick_params(axis='x', rotation=45)
+
+        elif plot_choice in ["Scatter Plot", "Line Plot"]:
+            require_numeric(df, [col1, col2], "Please select numeric columns for this plot.")
+            aggregate = len(df) > AGGREGATE_ROW_THRESHOLD
+            if plot_choice == "Scatter Plot":
+                if aggregate:
+                    with tracer.span("data prep"):
+                        view = DensityView(df[col1], df[col2], df[col3] if col3 else None, log_scale, index_cache)
+                    view.draw(ax)
+                else:
+                    sns.scatterplot(x=df[col1], y=df[col2], hue=df[col3] if col3 else None, ax=ax)
+                    if log_scale:
+                        ax.set_xscale('log')
+                        ax.set_yscale('log')
+                ax.set_title(f'Scatter Plot: {col2} vs {col1}')
+            else:
+                if aggregate:
+                    with tracer.span("data prep"):
+                        view = LineView(df[col1], df[col2], index_cache)
+                    view.draw(ax)
+                else:
+                    sorted_df = df.sort_values(by=col1)
+                    sns.lineplot(x=sorted_df[col1], y=sorted_df[col2], ax=ax)
+                ax.set_title(f'Line Plot: {col2} vs {col1}')
+
+        elif plot_choice == "Heatmap (Correlation)":
+            numeric_df = df.select_dtypes(include=np.number)
+            if numeric_df.shape[1] < 2:
+                raise PlotError("Need at least two numeric columns for a heatmap.")
+            sns.heatmap(stat(("corr",), numeric_df.corr), annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
+            ax.set_title('Correlation Heatmap')
+
+    with tracer.span("tight_layout"):
+        fig.tight_layout()
+    return fig, view
+
+
+def render_stream_plot(profile, spec, groups=None):
+    """Draw spec from out-of-core aggregates instead of a DataFrame.
+
+    profile is a stream_stats.ProfileState. Box Plot additionally needs groups,
+    the stream_stats.GroupedBoxState for the selected columns. Plot types that
+    need individual rows raise PlotError.
+    """
+    plot_choice = spec.plot_type
+    col1, col2, col3 = spec.col1, spec.col2, spec.col3
+    if plot_choice not in STREAM_PLOTS:
+        raise PlotError(f"{plot_choice} needs individual rows and is not available in out-of-core mode.")
+    if plot_choice in ONE_COLUMN_PLOTS and col1 is None or plot_choice in TWO_COLUMN_PLOTS and col2 is None:
+        raise PlotError(f"{plot_choice} requires more column selections.")
+
+    fig = Figure(figsize=(8, 6), dpi=100)
+    ax = fig.add_subplot(111)
+
+    if plot_choice == "Histogram":
+        if not profile.is_numeric(col1):
+            raise PlotError("Please select a numeric column for Histogram.")
+        counts, edges = profile.histogram(col1, spec.bins, spec.log_scale)
+        ax.stairs(counts, edges, fill=True, alpha=0.75)
+        if spec.log_scale:
+            ax.set_xscale('log')
+        ax.set_xlabel(col1)
+        ax.set_ylabel('Count')
+        ax.set_title(f'Histogram of {col1}')
+
+    elif plot_choice in ["Bar Chart (Counts)", "Pie Chart"]:
+        counts = profile.value_counts(col1)
+        if counts is None:
+            raise PlotError(f"{col1} has too many distinct values to count in out-of-core mode.")
+        if plot_choice == "Bar Chart (Counts)":
+            ax.bar([str(v) for v in counts.index], counts.values, color=sns.color_palette('viridis', len(counts)))
+            ax.set_xlabel(col1)
+            ax.set_ylabel('count')
+            ax.set_title(f'Distribution of {col1}')
+            ax.tick_params(axis='x', rotation=45)
+        else:
+            ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette('pastel'))
+            ax.set_title(f'Proportion of {col1}')
+            ax.axis('equal')
+
+    elif plot_choice == "Box Plot":
+        if not profile.is_numeric(col2):
+            raise PlotError("Y-Axis must be numeric for this plot.")
+        draw_group_boxes(ax, groups.box_stats(), col3)
+        ax.set_xlabel(col1)
+        ax.set_ylabel(col2)
+        ax.set_title(f'{plot_choice}: {col2} by {col1}')
+        ax.tick_params(axis='x', rotation=45)
+
+    elif plot_choice == "Heatmap (Correlation)":
+        if len(profile.numeric) < 2:
+            raise PlotError("Need at least two numeric columns for a heatmap.")
+        sns.heatmap(profile.corr(), annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
+        ax.set_title('Correlation Heatmap')
+
+    fig.tight_layout()
+    return fig
+
+
+def level_order(levels):
+    try:
+        return sorted(levels)
+    except TypeError:
+        return sorted(levels, key=str)
+
+
+def group_layout(stats, hue_name=None):
+    """x levels, hue levels, colours and box width for drawing stats keyed by (x, hue), dodged like seaborn."""
+    x_levels = level_order({key[0] for key in stats})
+    hue_levels = level_order({key[1] for key in stats})
+    colors = sns.color_palette('muted', len(hue_levels) if hue_name else len(x_levels))
+    return x_levels, hue_levels, colors, 0.8 / len(hue_levels)
+
+
+def finish_group_axes(ax, x_levels, hue_levels, colors, hue_name):
+    ax.set_xticks(range(len(x_levels)), [str(x) for x in x_levels])
+    ax.set_xlim(-0.5, len(x_levels) - 0.5)
+    if hue_name:
+        ax.legend(handles=[Patch(color=c, label=str(h)) for c, h in zip(colors, hue_levels)], title=hue_name)
+
+
+def draw_group_boxes(ax, stats, hue_name=None, show_fliers=False):
+    """Draw precomputed box statistics keyed by (x, hue), dodging hue levels like seaborn."""
+    x_levels, hue_levels, colors, width = group_layout(stats, hue_name)
+    for h, hue in enumerate(hue_levels):
+        keys = [(x, hue) for x in x_levels if (x, hue) in stats]
+        positions = [x_levels.index(x) - 0.4 + width * (h + 0.5) for x, _ in keys]
+        boxes = ax.bxp([stats[key] for key in keys], positions=positions, widths=width * 0.9,
+                       patch_artist=True, showfliers=show_fliers, manage_ticks=False,
+                       flierprops=dict(marker='d', markersize=4, markerfacecolor='0.3', markeredgecolor='none'))
+        for key, box in zip(keys, boxes['boxes']):
+            box.set_facecolor(colors[h] if hue_name else colors[x_levels.index(key[0])])
+        for median in boxes['medians']:
+            median.set_color('black')
+    finish_group_axes(ax, x_levels, hue_levels, colors, hue_name)
+
+
+def draw_group_violins(ax, stats, hue_name=None):
+    """Draw violins from the KDEs in group_summaries() output, with a box of quartiles and whiskers inside.
+
+    Every violin encloses the same area, as with seaborn's default density_norm="area".
+    """
+    x_levels, hue_levels, colors, width = group_layout(stats, hue_name)
+    peak = max((stat['kde'][1].max() for stat in stats.values() if stat['kde'] is not None), default=1.0)
+    scale = width * 0.45 / peak
+    for (x, hue), stat in stats.items():
+        h = hue_levels.index(hue)
+        position = x_levels.index(x) - 0.4 + width * (h + 0.5)
+        color = colors[h] if hue_name else colors[x_levels.index(x)]
+        if stat['kde'] is not None:
+            grid, density = stat['kde']
+            ax.fill_betweenx(grid, position - density * scale, position + density * scale,
+                             facecolor=color, edgecolor='0.33', linewidth=1.25)
+        ax.vlines(position, stat['whislo'], stat['whishi'], color='0.33', linewidth=1.875)
+        ax.vlines(position, stat['q1'], stat['q3'], color='0.33', linewidth=5.625)
+        ax.scatter([position], [stat['med']], s=12, color='white', zorder=3)
+    finish_group_axes(ax, x_levels, hue_levels, colors, hue_name)
+
+
+def artist_points(artist):
+    """Number of data points an artist draws: markers of a scatter, vertices of lines and fills."""
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+    return max(len(artist.get_offsets()), sum(len(path.vertices) for path in artist.get_paths()))
+
+
+def rasterize_dense_artists(fig, ext, dpi):
+    """Mark the data artists of fig that are smaller as an image than as ext paths as rasterized; returns them.
+
+    The vector backend embeds those layers as an image at dpi, while axes,
+    ticks and text stay vector.
+    """
+    dense = []
+    for ax in fig.axes:
+        raster_bytes = ax.bbox.width * ax.bbox.height * (dpi / fig.dpi) ** 2 * RASTER_BYTES_PER_PIXEL
+        dense += [artist for artist in (*ax.collections, *ax.lines) if not artist.get_rasterized()
+                  and artist_points(artist) * VECTOR_BYTES_PER_POINT[ext] > raster_bytes]
+    for artist in dense:
+        artist.set_rasterized(True)
+    return dense
+
+
+def export_figure(fig, paths, dpi=300, on_progress=None):
+    """Write fig to every path, picking the format from each extension.
+
+    The tight bounding box is computed once and shared by all the formats, and
+    data layers that would be smaller as an image are rasterized in PDF and SVG. on_progress(done,
+    total, path) is called before each file is written.
+    """
+    with tracer.span("layout"):
+        fig.draw_without_rendering()
+        bbox = fig.get_tightbbox().padded(rcParams['savefig.pad_inches'])
+    for i, path in enumerate(paths):
+        ext = os.path.splitext(path)[1].lstrip('.').lower()
+        if on_progress:
+            on_progress(i, len(paths), path)
+        rasterized = rasterize_dense_artists(fig, ext, dpi) if ext in VECTOR_BYTES_PER_POINT else []
+        try:
+            with tracer.span(f"savefig {ext}"):
+                fig.savefig(path, dpi=dpi, bbox_inches=bbox)
+        finally:
+            for artist in rasterized:
+                artist.set_rasterized(False)
+
+
+def export_worker(tasks, events):
+    """Process entry point: export each (task_id, pickled figure, paths, dpi, (trace, profile)) read from tasks until None.
+
+    Progress, results and errors are put on events as (task_id, kind, payload).
+    The "done" payload is (paths, record): with trace set, record holds the
+    export's spans, and with profile its cProfile stats, for tracer.attach()
+    in the requesting process; otherwise it is None.
+    """
+    for task_id, data, paths, dpi, (trace, profile) in iter(tasks.get, None):
+        tracer.enabled, tracer.profile_actions = trace, profile
+        try:
+            report = lambda done, total, path: events.put((task_id, "progress", (done, total, path)))
+            with tracer.action("export process"):
+                export_figure(pickle.loads(data), paths, dpi, on_progress=report)
+            events.put((task_id, "done", (paths, tracer.detach_last_action() if trace else None)))
+        except Exception as e:
+            tracer.clear()
+            events.put((task_id, "error", str(e)))
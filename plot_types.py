@@ -0,0 +1,23 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""The plot types and the columns each one takes.
+
+Kept free of heavy imports, so the GUI can build its controls before pandas and matplotlib have loaded.
+"""
+PLOT_TYPES = ["Histogram", "Bar Chart (Counts)", "Pie Chart", "Box Plot", "Scatter Plot", "Line Plot", "Violin Plot", "Heatmap (Correlation)", "Pair Plot"]
+ONE_COLUMN_PLOTS = ["Histogram", "Bar Chart (Counts)", "Pie Chart", "Box Plot", "Scatter Plot", "Line Plot", "Violin Plot"]
+TWO_COLUMN_PLOTS = ["Scatter Plot", "Line Plot", "Box Plot", "Violin Plot"]
+STREAM_PLOTS = ["Histogram", "Bar Chart (Counts)", "Pie Chart", "Box Plot", "Heatmap (Correlation)"]
+# The column pickers each plot type shows: (label, accepted columns, optional),
+# in col1, col2, col3 order. "numeric" offers only the columns render_plot
+# accepts as numeric; "any" offers every column.
+COLUMN_SLOTS = {
+    "Histogram": [("Select Column:", "numeric", False)],
+    "Bar Chart (Counts)": [("Select Column:", "any", False)],
+    "Pie Chart": [("Select Column:", "any", False)],
+    "Box Plot": [("X-Axis Column:", "any", False), ("Y-Axis Column:", "numeric", False), ("Color (Hue) Column (Optional):", "any", True)],
+    "Violin Plot": [("X-Axis Column:", "any", False), ("Y-Axis Column:", "numeric", False), ("Color (Hue) Column (Optional):", "any", True)],
+    "Scatter Plot": [("X-Axis Column:", "numeric", False), ("Y-Axis Column:", "numeric", False), ("Color (Hue) Column (Optional):", "any", True)],
+    "Line Plot": [("X-Axis Column:", "numeric", False), ("Y-Axis Column:", "numeric", False)],
+}
@@ -0,0 +1,679 @@
+#Developed by ODAT project
+#please see https://odat.info
+#please see https://github.com/ODAT-Project
+"""Out-of-core statistics: bounded-memory aggregates computed in one chunked pass over a file.
+
+Every state object here has update(chunk) and merge(other). A file is split into
+partitions that are scanned in separate worker processes, and the partial
+states are merged. Memory stays flat whatever the number of rows.
+
+The same sketches back the per-column profiles of the data summary window,
+for in-memory frames as well as out-of-core ones.
+"""
+import io
+import math
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from plot_engine import LOAD_CHUNK_ROWS, ByteRange, cache_path_for, feather, pa, source_signature
+
+CATEGORY_COUNT_LIMIT = 1000
+HISTOGRAM_RESOLUTION = 4096
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_MIN_MAGNITUDE = 1e-12
+GROUP_LIMIT = 500
+KIND_SAMPLE_ROWS = 10_000
+PARTITION_MIN_BYTES = 32 * 1024 * 1024
+PARTITIONS_PER_WORKER = 4
+HLL_PRECISION = 14
+DISTINCT_EXACT_MAX_ROWS = 1_000_000
+SUMMARY_SAMPLE_ROWS = 200_000
+SUMMARY_TOP_CATEGORIES = 5
+
+
+class HyperLogLog:
+    """Approximate distinct count (about 1% error) in 2**precision bytes, mergeable by register-wise max."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, series):
+        hashes = pd.util.hash_pandas_object(series.dropna(), index=False, categorize=False).to_numpy()
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        # Fewer than 53 tail bits, so the float conversion in frexp is exact.
+        tail = (hashes & np.uint64((1 << tail_bits) - 1)).astype(np.float64)
+        rank = (tail_bits + 1 - np.frexp(tail)[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting is more accurate for small counts
+        return int(round(estimate))
+
+
+class CategoryCounts:
+    """Exact value counts that give up (overflow) once a column has too many distinct values.
+
+    On overflow the distinct values seen so far seed a HyperLogLog, which
+    keeps an approximate distinct count from then on.
+    """
+
+    def __init__(self, limit=CATEGORY_COUNT_LIMIT):
+        self.limit = limit
+        self.counts = {}
+        self.overflow = False
+        self.sketch = None
+
+    def _overflow(self, extra_values=()):
+        self.sketch = HyperLogLog()
+        self.sketch.update(pd.Series([*self.counts, *extra_values]))
+        self.overflow = True
+        self.counts = {}
+
+    def add_counts(self, items):
+        if self.overflow:
+            self.sketch.update(pd.Series([value for value, _ in items]))
+            return
+        for value, count in items:
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        if len(self.counts) > self.limit:
+            self._overflow()
+
+    def update(self, series):
+        if self.overflow:
+            self.sketch.update(series)
+            return
+        counts = series.value_counts()
+        counts = counts[counts > 0]  # categorical columns report unused categories too
+        if len(counts) > self.limit:
+            self._overflow(counts.index)
+            return
+        self.add_counts(counts.items())
+
+    def merge(self, other):
+        if not other.overflow:
+            self.add_counts(other.counts.items())
+            return
+        if not self.overflow:
+            self._overflow()
+        self.sketch.merge(other.sketch)
+
+    def distinct(self):
+        return self.sketch.count() if self.overflow else len(self.counts)
+
+    def series(self):
+        return pd.Series(self.counts, dtype='int64').sort_values(ascending=False, kind='stable')
+
+
+class StreamingHistogram:
+    """Fixed-resolution histogram whose range doubles to take in new extremes.
+
+    When the range doubles, pairs of bins merge, so counts stay exact at the
+    current resolution. Each bin also keeps the sum of its values. histogram()
+    re-bins to any requested edges by placing each fine bin's mass at its
+    mean, which is exact for integer-valued data.
+    """
+
+    def __init__(self, resolution=HISTOGRAM_RESOLUTION):
+        self.resolution = resolution
+        self.lo = None
+        self.width = None
+        self.counts = np.zeros(resolution, dtype=np.int64)
+        self.sums = np.zeros(resolution)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def hi(self):
+        return self.lo + self.width * self.resolution
+
+    def _double(self, extend_left):
+        pairs = self.counts.reshape(-1, 2).sum(axis=1)
+        pair_sums = self.sums.reshape(-1, 2).sum(axis=1)
+        padding = np.zeros(self.resolution // 2, dtype=np.int64)
+        if extend_left:
+            self.lo -= self.width * self.resolution
+            self.counts = np.concatenate([padding, pairs])
+            self.sums = np.concatenate([padding, pair_sums])
+        else:
+            self.counts = np.concatenate([pairs, padding])
+            self.sums = np.concatenate([pair_sums, padding])
+        self.width *= 2
+
+    def _cover(self, lo, hi):
+        while lo < self.lo or hi >= self.hi:
+            self._double(extend_left=lo < self.lo)
+
+    def _start(self, lo, hi):
+        self.lo = lo
+        self.width = (hi - lo) / (self.resolution - 1) if hi > lo else 1.0
+
+    def add(self, values):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        lo, hi = float(values.min()), float(values.max())
+        if self.lo is None:
+            self._start(lo, hi)
+        self._cover(lo, hi)
+        self.min, self.max = min(self.min, lo), max(self.max, hi)
+        index = np.clip(((values - self.lo) / self.width).astype(np.int64), 0, self.resolution - 1)
+        self.counts += np.bincount(index, minlength=self.resolution)
+        self.sums += np.bincount(index, weights=values, minlength=self.resolution)
+
+    def merge(self, other):
+        if other.lo is None:
+            return
+        if self.lo is None:
+            self.lo, self.width, self.counts, self.sums = other.lo, other.width, other.counts.copy(), other.sums.copy()
+            self.min, self.max = other.min, other.max
+            return
+        self._cover(other.min, other.max)
+        while self.width < other.width:
+            self._double(extend_left=False)
+        # Partitions' grids are not aligned, so other's bins move by their means (error < one bin).
+        occupied = other.counts > 0
+        means = other.sums[occupied] / other.counts[occupied]
+        index = np.clip(((means - self.lo) / self.width).astype(np.int64), 0, self.resolution - 1)
+        self.counts += np.bincount(index, weights=other.counts[occupied], minlength=self.resolution).astype(np.int64)
+        self.sums += np.bincount(index, weights=other.sums[occupied], minlength=self.resolution)
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def count_below(self, x):
+        """Approximate number of values < x, counting each fine bin as if all its values sat at its mean."""
+        x = np.asarray(x, dtype=float)
+        index = np.clip(((x - self.lo) / self.width).astype(np.int64), 0, self.resolution - 1)
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.sums[index] / self.counts[index]
+        return cumulative[index] + np.where(means < x, self.counts[index], 0)
+
+    def histogram(self, bins):
+        lo, hi = (self.min, self.max) if self.max > self.min else (self.min - 0.5, self.max + 0.5)
+        edges = np.linspace(lo, hi, bins + 1)
+        cumulative = self.count_below(edges)
+        cumulative[0], cumulative[-1] = 0, self.total
+        return np.diff(cumulative).astype(float), edges
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style log buckets)."""
+
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _add_to_store(self, store, magnitudes):
+        if len(magnitudes) == 0:
+            return
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        offset = keys.min()
+        counts = np.bincount(keys - offset)
+        for key in np.flatnonzero(counts):
+            store[int(key + offset)] = store.get(int(key + offset), 0) + int(counts[key])
+
+    def add(self, values):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min, self.max = min(self.min, float(values.min())), max(self.max, float(values.max()))
+        self.zeros += int((np.abs(values) < SKETCH_MIN_MAGNITUDE).sum())
+        self._add_to_store(self.positive, values[values >= SKETCH_MIN_MAGNITUDE])
+        self._add_to_store(self.negative, -values[values <= -SKETCH_MIN_MAGNITUDE])
+
+    def merge(self, other):
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+    def buckets(self):
+        """Representative values and counts of every bucket, in ascending value order."""
+        value = lambda key: 2 * self.gamma ** key / (self.gamma + 1)
+        negative = sorted(self.negative, reverse=True)
+        positive = sorted(self.positive)
+        values = [-value(k) for k in negative] + [0.0] + [value(k) for k in positive]
+        counts = [self.negative[k] for k in negative] + [self.zeros] + [self.positive[k] for k in positive]
+        return np.clip(np.array(values), self.min, self.max), np.array(counts, dtype=np.int64)
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        values, counts = self.buckets()
+        ranks = np.asarray(qs, dtype=float) * (self.count - 1)
+        return values[np.searchsorted(np.cumsum(counts), ranks, side='right')]
+
+    def cdf(self, x):
+        """Approximate number of values <= x."""
+        values, counts = self.buckets()
+        cumulative = np.concatenate([[0], np.cumsum(counts)])
+        return cumulative[np.searchsorted(values, x, side='right')]
+
+    def nearest_inside(self, lo, hi):
+        """Smallest and largest bucket values within [lo, hi] (the box-plot whisker ends)."""
+        values, counts = self.buckets()
+        inside = values[(counts > 0) & (values >= lo) & (values <= hi)]
+        if len(inside) == 0:
+            return lo, hi
+        return inside[0], inside[-1]
+
+
+class CoMoments:
+    """Pairwise-complete counts, sums and co-moments of numeric columns.
+
+    Values are shifted by a per-column reference (the first chunk's mean)
+    before summing, which keeps the textbook sum-of-products formulas
+    numerically stable. States with different shifts are rebased when merged.
+    """
+
+    def __init__(self, columns):
+        k = len(columns)
+        self.columns = list(columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sums = np.zeros((k, k))     # [i, j]: sum of x_i over rows where both i and j are present
+        self.squares = np.zeros((k, k))  # [i, j]: sum of x_i ** 2 over the same rows
+        self.products = np.zeros((k, k))
+
+    def add(self, values):
+        valid = np.isfinite(values)
+        if self.shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+        x = np.where(valid, values - self.shift, 0.0)
+        present = valid.astype(float)
+        self.n += present.T @ present
+        self.sums += x.T @ present
+        self.squares += (x * x).T @ present
+        self.products += x.T @ x
+
+    def rebase(self, shift):
+        d = self.shift - shift
+        self.products += self.sums * d[None, :] + self.sums.T * d[:, None] + np.outer(d, d) * self.n
+        self.squares += 2 * d[:, None] * self.sums + (d ** 2)[:, None] * self.n
+        self.sums += d[:, None] * self.n
+        self.shift = shift
+
+    def merge(self, other):
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        if not np.array_equal(other.shift, self.shift):
+            other = _copy_state(other)
+            other.rebase(self.shift)
+        self.n += other.n
+        self.sums += other.sums
+        self.squares += other.squares
+        self.products += other.products
+
+    def _diagonal(self):
+        n = np.diag(self.n)
+        return n, np.diag(self.sums), np.diag(self.squares)
+
+    def means(self):
+        n, sums, _ = self._diagonal()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.shift if self.shift is not None else 0) + sums / n
+
+    def corr(self):
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.products - self.sums * self.sums.T / n
+            var_i = self.squares - self.sums ** 2 / n
+            corr = cov / np.sqrt(var_i * var_i.T)
+        corr[n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+
+def _copy_state(state):
+    clone = object.__new__(type(state))
+    clone.__dict__ = {key: (value.copy() if isinstance(value, np.ndarray) else value) for key, value in state.__dict__.items()}
+    return clone
+
+
+def numeric_values(series):
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+class ProfileState:
+    """Whole-file aggregates behind the out-of-core plots and data summary.
+
+    Per column: null count and category counts. Per numeric column: a
+    streaming histogram, a quantile sketch, and the co-moments used for the
+    correlation heatmap.
+    """
+
+    def __init__(self, kinds):
+        self.kinds = dict(kinds)
+        self.numeric = [col for col, kind in self.kinds.items() if kind == 'numeric']
+        self.numeric_position = {col: i for i, col in enumerate(self.numeric)}
+        self.rows = 0
+        self.nulls = dict.fromkeys(self.kinds, 0)
+        self.counts = {col: CategoryCounts() for col in self.kinds}
+        self.histograms = {col: StreamingHistogram() for col in self.numeric}
+        self.sketches = {col: QuantileSketch() for col in self.numeric}
+        self.moments = CoMoments(self.numeric)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        block = np.empty((len(chunk), len(self.numeric)))
+        for col, kind in self.kinds.items():
+            if kind == 'numeric':
+                values = numeric_values(chunk[col])
+                block[:, self.numeric_position[col]] = values
+                self.nulls[col] += int(np.isnan(values).sum())
+                self.histograms[col].add(values)
+                self.sketches[col].add(values)
+                self.counts[col].update(pd.Series(values))
+            else:
+                self.nulls[col] += int(chunk[col].isna().sum())
+                self.counts[col].update(chunk[col])
+        self.moments.add(block)
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col in self.kinds:
+            self.nulls[col] += other.nulls[col]
+            self.counts[col].merge(other.counts[col])
+        for col in self.numeric:
+            self.histograms[col].merge(other.histograms[col])
+            self.sketches[col].merge(other.sketches[col])
+        self.moments.merge(other.moments)
+
+    @property
+    def columns(self):
+        return list(self.kinds)
+
+    def is_numeric(self, col):
+        return self.kinds.get(col) == 'numeric'
+
+    def value_counts(self, col):
+        """Counts per category, or None when the column has more than CATEGORY_COUNT_LIMIT values."""
+        counts = self.counts[col]
+        return None if counts.overflow else counts.series()
+
+    def histogram(self, col, bins, log_scale=False):
+        if not log_scale:
+            return self.histograms[col].histogram(bins)
+        sketch = self.sketches[col]
+        lo = max(sketch.min, SKETCH_MIN_MAGNITUDE) if sketch.max > 0 else 1.0
+        edges = np.logspace(np.log10(lo), np.log10(max(sketch.max, lo * 10)), bins + 1)
+        return np.diff(sketch.cdf(edges)).astype(float), edges
+
+    def corr(self):
+        return self.moments.corr()
+
+    def column_profile(self, col):
+        counts = self.counts[col]
+        profile = ColumnProfile(col, self.kinds[col], self.rows - self.nulls[col], self.nulls[col], counts.distinct(), approximate=counts.overflow)
+        if self.is_numeric(col):
+            sketch = self.sketches[col]
+            if sketch.count:
+                profile.min, profile.max = sketch.min, sketch.max
+                profile.mean = self.moments.means()[self.numeric_position[col]]
+                profile.quantiles = tuple(sketch.quantiles([0.25, 0.5, 0.75]))
+                profile.approximate_quantiles = True
+        elif not counts.overflow:
+            profile.top = list(counts.series().head(SUMMARY_TOP_CATEGORIES).items())
+        return profile
+
+
+@dataclass
+class ColumnProfile:
+    """One column's entry in the data summary. approximate marks estimated distinct and top counts."""
+    name: str
+    dtype: str
+    count: int
+    nulls: int
+    distinct: int
+    approximate: bool = False
+    approximate_quantiles: bool = False
+    min: object = None
+    max: object = None
+    mean: float = None
+    quantiles: tuple = None
+    top: list = None
+
+
+def profile_column(series):
+    """ColumnProfile of an in-memory column.
+
+    Columns over DISTINCT_EXACT_MAX_ROWS rows get a HyperLogLog distinct count,
+    and, unless categorical, top values counted on a sample and scaled up.
+    """
+    nulls = int(series.isna().sum())
+    large = len(series) > DISTINCT_EXACT_MAX_ROWS
+    profile = ColumnProfile(series.name, str(series.dtype), len(series) - nulls, nulls, 0)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)), index=series.cat.categories)
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        profile.distinct = len(counts)
+        profile.top = list(counts.head(SUMMARY_TOP_CATEGORIES).items())
+        return profile
+    if large:
+        sketch = HyperLogLog()
+        sketch.update(series)
+        profile.distinct, profile.approximate = sketch.count(), True
+    else:
+        profile.distinct = int(series.nunique())
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values):
+            profile.min, profile.max, profile.mean = values.min(), values.max(), values.mean()
+            profile.quantiles = tuple(np.quantile(values, [0.25, 0.5, 0.75]))
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        profile.min, profile.max = series.min(), series.max()
+    else:
+        sample = series.sample(SUMMARY_SAMPLE_ROWS, random_state=0) if large else series
+        counts = sample.value_counts().head(SUMMARY_TOP_CATEGORIES) * (len(series) / len(sample))
+        profile.top = [(value, int(round(count))) for value, count in counts.items()]
+    return profile
+
+
+class GroupedBoxState:
+    """Quantile sketches of y per (x, hue) group, for box plots of files larger than memory."""
+
+    def __init__(self, x, y, hue=None, limit=GROUP_LIMIT):
+        self.x, self.y, self.hue = x, y, hue
+        self.limit = limit
+        self.rows = 0
+        self.sketches = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        frame = pd.DataFrame({
+            'x': chunk[self.x],
+            'hue': chunk[self.hue] if self.hue else '',
+            'y': numeric_values(chunk[self.y]),
+        }).dropna()
+        for key, values in frame.groupby(['x', 'hue'], sort=False, observed=True)['y']:
+            self.sketches.setdefault(key, QuantileSketch()).add(values.to_numpy())
+        if len(self.sketches) > self.limit:
+            raise ValueError(f"More than {self.limit} (x, hue) groups; choose lower-cardinality columns.")
+
+    def merge(self, other):
+        self.rows += other.rows
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+            else:
+                self.sketches[key] = sketch
+
+    def box_stats(self):
+        """Matplotlib bxp() statistics per group, keyed by (x, hue), with whiskers at 1.5 IQR."""
+        stats = {}
+        for key, sketch in self.sketches.items():
+            q1, med, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+            iqr = q3 - q1
+            whislo, whishi = sketch.nearest_inside(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+            stats[key] = dict(med=med, q1=q1, q3=q3, whislo=whislo, whishi=whishi, fliers=[], label=str(key[0]))
+        return stats
+
+
+def infer_kinds(filepath):
+    """Map each column to 'numeric' or 'categorical' from the columnar cache or a sample of rows."""
+    cache = fresh_cache(filepath)
+    sample = feather.read_table(cache, memory_map=True).slice(0, KIND_SAMPLE_ROWS).to_pandas() if cache else pd.read_csv(filepath, nrows=KIND_SAMPLE_ROWS)
+    return {col: 'numeric' if pd.api.types.is_numeric_dtype(sample[col]) else 'categorical' for col in sample.columns}
+
+
+def fresh_cache(filepath):
+    """Path of filepath's columnar cache if it is up to date, else None."""
+    if feather is None:
+        return None
+    path = cache_path_for(filepath)
+    try:
+        schema = pa.ipc.open_file(pa.memory_map(path)).schema
+    except (OSError, pa.ArrowException):
+        return None
+    metadata = schema.metadata or {}
+    if any(metadata.get(key) != value for key, value in source_signature(filepath).items()):
+        return None
+    return path
+
+
+def csv_partitions(filepath, n_parts):
+    """Byte ranges of the data rows split into about n_parts pieces at line boundaries.
+
+    Quoted fields containing newlines are not supported by this split.
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as handle:
+        handle.readline()
+        bounds = [handle.tell()]
+        for i in range(1, n_parts):
+            handle.seek(bounds[0] + (size - bounds[0]) * i // n_parts)
+            handle.readline()
+            bounds.append(max(handle.tell(), bounds[-1]))
+    bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def scan_csv_partition(filepath, start, stop, columns, new_state, chunk_rows=LOAD_CHUNK_ROWS, on_chunk=None):
+    state = new_state()
+    with open(filepath, 'rb') as handle:
+        handle.seek(start)
+        reader = io.BufferedReader(ByteRange(handle, stop - start))
+        for chunk in pd.read_csv(reader, header=None, names=columns, chunksize=chunk_rows):
+            state.update(chunk)
+            if on_chunk:
+                on_chunk(reader.raw.consumed, state.rows)
+    return state
+
+
+def scan_cache_partition(cache, first, stop, new_state, on_chunk=None):
+    state = new_state()
+    reader = pa.ipc.open_file(pa.memory_map(cache))
+    for i in range(first, stop):
+        state.update(reader.get_batch(i).to_pandas())
+        if on_chunk:
+            on_chunk(i + 1 - first, state.rows)
+    return state
+
+
+def scan(filepath, new_state, workers=None, chunk_rows=LOAD_CHUNK_ROWS, on_progress=None, is_cancelled=None):
+    """Feed every chunk of filepath to new_state().update and return the merged state.
+
+    The columnar cache is scanned instead of the CSV when it is up to date.
+    Large files are split into partitions scanned in worker processes.
+    on_progress(done, total, rows) reports bytes (or cache batches) scanned.
+    Returns None if is_cancelled() turns true.
+    """
+    workers = workers or os.cpu_count() or 1
+    cache = fresh_cache(filepath)
+    if cache is not None:
+        n_batches = pa.ipc.open_file(pa.memory_map(cache)).num_record_batches
+        step = max(1, math.ceil(n_batches / (workers * PARTITIONS_PER_WORKER)))
+        total = n_batches
+        tasks = [partial(scan_cache_partition, cache, first, min(first + step, n_batches), new_state)
+                 for first in range(0, n_batches, step)]
+        sizes = [min(first + step, n_batches) - first for first in range(0, n_batches, step)]
+    else:
+        total = os.path.getsize(filepath)
+        columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+        n_parts = max(1, min(workers * PARTITIONS_PER_WORKER, total // PARTITION_MIN_BYTES))
+        parts = csv_partitions(filepath, n_parts)
+        tasks = [partial(scan_csv_partition, filepath, start, stop, columns, new_state, chunk_rows) for start, stop in parts]
+        sizes = [stop - start for start, stop in parts]
+
+    if len(tasks) <= 1 or workers == 1:
+        return _scan_in_process(tasks, sizes, total, new_state, on_progress, is_cancelled)
+
+    result = new_state()
+    done = 0
+    # Spawned (not forked) workers, so a Tk parent process is never duplicated.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(task): size for task, size in zip(tasks, sizes)}
+        for future in as_completed(futures):
+            if is_cancelled and is_cancelled():
+                executor.shutdown(cancel_futures=True)
+                return None
+            result.merge(future.result())
+            done += futures[future]
+            if on_progress:
+                on_progress(done, total, result.rows)
+    return result
+
+
+def _scan_in_process(tasks, sizes, total, new_state, on_progress, is_cancelled):
+    result = new_state()
+    done = 0
+
+    class Cancelled(Exception):
+        pass
+
+    def on_chunk(part_done, rows):
+        if is_cancelled and is_cancelled():
+            raise Cancelled
+        if on_progress:
+            on_progress(done + part_done, total, result.rows + rows)
+
+    try:
+        for task, size in zip(tasks, sizes):
+            result.merge(task(on_chunk=on_chunk))
+            done += size
+    except Cancelled:
+        return None
+    return result
+
+
+def profile_file(filepath, **scan_options):
+    """One pass over filepath computing its ProfileState."""
+    return scan(filepath, partial(ProfileState, infer_kinds(filepath)), **scan_options)
+
+
+def grouped_box_stats(filepath, x, y, hue=None, **scan_options):
+    """One pass over filepath collecting per-group quantile sketches of y."""
+    return scan(filepath, partial(GroupedBoxState, x, y, hue), **scan_options)